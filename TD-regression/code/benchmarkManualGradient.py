@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+import argparse
+import importlib.util
+import os
+import time
+import torch
+from dataLoader import getTensorsFromDataFile
+from manualGradient import ManualUniversalModel
+
+#-------------------------------------------------------------
+def loadNonLinearRegression(activationFunction):
+    """ Function that imports nonlinear-regression.py, whose name
+    is not a valid module name, to benchmark its autograd model.
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "nonlinear-regression.py")
+    spec = importlib.util.spec_from_file_location("nonlinearRegression", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    # the activation function is a global set by the script
+    module.sigma = torch.sigmoid if activationFunction == "sigmoid" else torch.relu
+    return module
+
+#-------------------------------------------------------------
+def timeEpochs(step, nbEpochs):
+    step() # warm-up
+    start = time.perf_counter()
+    for _ in range(nbEpochs):
+        step()
+    return nbEpochs / (time.perf_counter() - start)
+
+#-------------------------------------------------------------
+def main():
+
+    #parse command line
+    parser = argparse.ArgumentParser(description="program that compares \
+    the number of epochs per second of the autograd and manual gradient \
+    engines of the one-hidden-layer network")
+    parser.add_argument("datafile",
+                        help="path to a data file containing two fields \
+                        per line: x y")
+    parser.add_argument("-n", "--nbEpochs",
+                        help="number of timed epochs",
+                        type=int, default=100)
+    parser.add_argument("-r", "--learningRate",
+                        help="learning rate",
+                        type=float, default=1e-6)
+    parser.add_argument("-f", "--activationFunction",
+                        help="activation function",
+                        choices=["sigmoid", "relu"],
+                        default="sigmoid")
+    args = parser.parse_args()
+
+    nonlinear = loadNonLinearRegression(args.activationFunction)
+    x, y = getTensorsFromDataFile(args.datafile)
+
+    print("# k autograd(epochs/s) manual(epochs/s) speedup max|dw|")
+    for k in [1, 16, 256, 4096]:
+        reference = nonlinear.UniversalModel(k)
+        manual = ManualUniversalModel(k, args.activationFunction)
+        with torch.no_grad():
+            manual.w.copy_(reference.w)
+            manual.b.copy_(reference.b)
+            manual.wp.copy_(reference.wp)
+
+        # agreement check after a few epochs from the same weights
+        for _ in range(5):
+            loss = nonlinear.mse(reference.forward(x), y)
+            loss.backward()
+            reference.update(args.learningRate)
+            manual.step(x, y, args.learningRate)
+        error = max((p - q).abs().max().item() for p, q in
+                    zip(reference.parameters(), manual.parameters()))
+
+        def autogradStep():
+            loss = nonlinear.mse(reference.forward(x), y)
+            loss.backward()
+            reference.update(args.learningRate)
+
+        def manualStep():
+            manual.step(x, y, args.learningRate)
+
+        autogradSpeed = timeEpochs(autogradStep, args.nbEpochs)
+        manualSpeed = timeEpochs(manualStep, args.nbEpochs)
+        print(f"{k} {autogradSpeed:.1f} {manualSpeed:.1f} "
+              f"{manualSpeed/autogradSpeed:.2f} {error:.2e}")
+
+#-------------------------------------------------------------
+if __name__ == "__main__":
+    main()
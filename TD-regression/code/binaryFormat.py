@@ -0,0 +1,13 @@
+import struct
+
+#-------------------------------------------------------------
+# binary format of the data files: a fixed-size header followed by
+# the columns, stored one after the other (column j holds the j-th
+# field of every line), so that each column is contiguous on disk.
+# It is read by dataLoader.py and also written by
+# sujet2/code/generateData.py, which loads this module by its path.
+#
+# header: magic (8 bytes), number of rows (uint64),
+#         number of columns (uint32), item size in bytes (uint32)
+BINARY_MAGIC = b"XYDATA01"
+BINARY_HEADER = struct.Struct("<8sQII")
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+
+import sys
+import argparse
+import numpy
+import torch
+from binaryFormat import BINARY_MAGIC, BINARY_HEADER
+
+# number of bytes read at once by the text parser
+CHUNK_SIZE = 1 << 24
+
+#-------------------------------------------------------------
+def isBinaryDataFile(path):
+    """ Function that tells whether a file is in the binary
+    format written by writeBinaryDataFile.
+
+    :param: path, path to the file
+    :return: True if the file starts with the binary magic number
+    """
+    with open(path, 'rb') as dataFile:
+        return dataFile.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+#-------------------------------------------------------------
+def countLines(path):
+    """ Function that counts the lines of a text file
+    without decoding it.
+
+    :param: path, path to the file
+    :return: the number of lines
+    """
+    nbLines = 0
+    lastByte = b"\n"
+    with open(path, 'rb') as dataFile:
+        while True:
+            chunk = dataFile.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            nbLines += chunk.count(b"\n")
+            lastByte = chunk[-1:]
+    #last line without a trailing newline
+    if lastByte != b"\n":
+        nbLines += 1
+    return nbLines
+
+#-------------------------------------------------------------
+def checkFieldsPerLine(chunk, nbCols):
+    """ Function that checks, without any python loop, that every
+    line of a chunk of text contains exactly nbCols fields.
+
+    :param: chunk, bytes made of complete lines
+    :param: nbCols, expected number of fields per line
+    :return: the number of lines of the chunk
+    :raise: ValueError if a line has a wrong number of fields
+    """
+    c = numpy.frombuffer(chunk, dtype=numpy.uint8)
+    isSpace = (c == ord(" ")) | (c == ord("\t")) | (c == ord("\r")) \
+        | (c == ord("\n"))
+    #a field starts at a non-space byte following a space byte
+    previousIsSpace = numpy.empty_like(isSpace)
+    previousIsSpace[0] = True
+    previousIsSpace[1:] = isSpace[:-1]
+    fieldStarts = numpy.flatnonzero(~isSpace & previousIsSpace)
+
+    newlines = numpy.flatnonzero(c == ord("\n"))
+    nbLines = newlines.shape[0]
+    if c[-1] != ord("\n"):
+        nbLines += 1
+    #line index of each field
+    lineOfField = numpy.searchsorted(newlines, fieldStarts)
+    fieldsPerLine = numpy.bincount(lineOfField, minlength=nbLines)
+    if fieldsPerLine.shape[0] != nbLines or numpy.any(fieldsPerLine != nbCols):
+        raise ValueError
+    return nbLines
+
+#-------------------------------------------------------------
+def iterateTextChunks(path, nbCols=2, dtype=numpy.float32, chunkSize=CHUNK_SIZE):
+    """ Generator that reads a file composed of lines containing
+    nbCols space-delimited fields by chunks of about chunkSize bytes,
+    so that only one chunk is in memory at a time.
+
+    :param: path, path to the file to read
+    :param: nbCols, expected number of fields per line
+    :param: dtype, numpy type of the yielded arrays
+    :param: chunkSize, number of bytes read at once
+    :return: (nbCols, m) numpy arrays whose row j contains the
+    j-th field of m consecutive lines.
+    """
+    remainder = b""
+    with open(path, 'rb') as dataFile:
+        while True:
+            chunk = dataFile.read(chunkSize)
+            if chunk:
+                #only parse complete lines, keep the rest for later
+                chunk = remainder + chunk
+                cut = chunk.rfind(b"\n") + 1
+                chunk, remainder = chunk[:cut], chunk[cut:]
+            else:
+                chunk, remainder = remainder, b""
+            if not chunk:
+                if not remainder:
+                    break
+                continue
+
+            #each line must contain exactly nbCols fields
+            nbLines = checkFieldsPerLine(chunk, nbCols)
+            values = numpy.fromstring(chunk, dtype=dtype, sep=" ")
+            if values.shape[0] != nbLines * nbCols:
+                raise ValueError
+            yield values.reshape(nbLines, nbCols).T
+
+#-------------------------------------------------------------
+def getArrayFromTextFile(path, nbCols=2, dtype=numpy.float32):
+    """ Function that reads a file composed of lines containing
+    nbCols space-delimited fields. The file is parsed by chunks
+    directly into a preallocated array, without building any
+    intermediate list of python floats.
+
+    :param: path, path to the file to read
+    :param: nbCols, expected number of fields per line
+    :param: dtype, numpy type of the returned array
+    :return: a (nbCols, nbLines) numpy array whose row j contains
+    the j-th field of every line.
+    """
+    nbRows = countLines(path)
+    data = numpy.empty((nbCols, nbRows), dtype=dtype)
+
+    start = 0
+    for chunk in iterateTextChunks(path, nbCols, dtype):
+        end = start + chunk.shape[1]
+        if end > nbRows:
+            raise ValueError
+        data[:, start:end] = chunk
+        start = end
+
+    if start != nbRows:
+        raise ValueError
+    return data
+
+#-------------------------------------------------------------
+def writeBinaryDataFile(path, data):
+    """ Function that writes a 2d array in the binary format:
+    a header followed by the rows of the array, that is the
+    columns of the data file, one after the other.
+
+    :param: path, path to the file to write
+    :param: data, a (nbCols, nbRows) numpy array
+    """
+    data = numpy.ascontiguousarray(data)
+    nbCols, nbRows = data.shape
+    with open(path, 'wb') as dataFile:
+        dataFile.write(BINARY_HEADER.pack(BINARY_MAGIC, nbRows,
+                                          nbCols, data.itemsize))
+        data.tofile(dataFile)
+
+#-------------------------------------------------------------
+def getArrayFromBinaryFile(path):
+    """ Function that memory-maps a file in the binary format.
+    Nothing is read until the values are accessed.
+
+    :param: path, path to the file to read
+    :return: a (nbCols, nbRows) numpy array backed by the file
+    """
+    with open(path, 'rb') as dataFile:
+        header = dataFile.read(BINARY_HEADER.size)
+    if len(header) != BINARY_HEADER.size:
+        raise ValueError
+    magic, nbRows, nbCols, itemSize = BINARY_HEADER.unpack(header)
+    if magic != BINARY_MAGIC:
+        raise ValueError
+    if itemSize == 4:
+        dtype = numpy.float32
+    elif itemSize == 8:
+        dtype = numpy.float64
+    else:
+        raise ValueError
+
+    #copy-on-write mapping: writable (as torch expects),
+    #but the file itself is never modified
+    return numpy.memmap(path, dtype=dtype, mode='c',
+                        offset=BINARY_HEADER.size,
+                        shape=(nbCols, nbRows))
+
+#-------------------------------------------------------------
+def getColumnsFromDataFile(path, nbCols=2, dtype=numpy.float32):
+    """ Function that reads a data file, either in the text format
+    (space-delimited fields) or in the binary format, and returns
+    its columns as a tensor. Binary files are wrapped without copy.
+
+    :param: path, path to the file to read
+    :param: nbCols, expected number of fields per line
+    :param: dtype, numpy type of the values read from a text file
+    :return: a (nbCols, nbRows) tensor
+    """
+    if isBinaryDataFile(path):
+        data = getArrayFromBinaryFile(path)
+        if data.shape[0] != nbCols:
+            raise ValueError
+    else:
+        data = getArrayFromTextFile(path, nbCols, dtype)
+    return torch.from_numpy(data)
+
+#-------------------------------------------------------------
+def getTensorsFromDataFile(path, nbFeatures=1):
+    """ Function that reads a file composed of lines containing
+    nbFeatures input fields followed by the value to predict, and
+    returns the tensors used by the regression models.
+
+    :param: path, path to the file to read
+    :param: nbFeatures, number of input fields per line
+    :return: a pair (x, y) where x is a (nbFeatures,n) tensor whose
+    row j contains the j-th feature of every sample, and y is a (1,n)
+    tensor containing the values to predict. Both are views of the
+    same column-major array, each feature being contiguous, of the
+    default torch type of the models (a float64 binary file is
+    converted, hence copied).
+    """
+    data = getColumnsFromDataFile(path, nbFeatures+1)
+    data = data.to(torch.get_default_dtype())
+    x = data[:-1]
+    y = data[-1:]
+    return (x, y)
+
+#-------------------------------------------------------------
+def iterateChunks(path, nbCols=2, dtype=numpy.float32, chunkSize=CHUNK_SIZE):
+    """ Generator that reads a data file, either in the text format
+    or in the binary format, by chunks of about chunkSize bytes.
+
+    :param: path, path to the file to read
+    :param: nbCols, expected number of fields per line
+    :param: dtype, numpy type of the values read from a text file
+    :param: chunkSize, number of bytes read at once
+    :return: (nbCols, m) numpy arrays
+    """
+    if isBinaryDataFile(path):
+        data = getArrayFromBinaryFile(path)
+        if data.shape[0] != nbCols:
+            raise ValueError
+        nbRows = data.shape[1]
+        step = max(1, chunkSize // (nbCols * data.itemsize))
+        for start in range(0, nbRows, step):
+            #copy, so that pages of the mapping already used can be released
+            yield numpy.array(data[:, start:start+step])
+    else:
+        yield from iterateTextChunks(path, nbCols, dtype, chunkSize)
+
+#-------------------------------------------------------------
+def iterateBatches(path, batchSize, shuffleBufferSize=0,
+                   nbFeatures=1, chunkSize=CHUNK_SIZE):
+    """ Generator that streams the mini-batches of a data file
+    composed of lines containing nbFeatures input fields followed by
+    the value to predict. At most
+    shuffleBufferSize + batchSize + one chunk of samples are in
+    memory at a time, whatever the size of the file.
+
+    Samples are shuffled within a buffer: once it holds at least
+    shuffleBufferSize samples, the buffer is permuted and all the
+    complete batches it contains are yielded, the remaining samples
+    being mixed with the next chunk.
+
+    :param: path, path to the file to read
+    :param: batchSize, number of samples per batch
+    :param: shuffleBufferSize, number of samples shuffled together
+    (0 for no shuffling)
+    :param: nbFeatures, number of input fields per line
+    :param: chunkSize, number of bytes read at once
+    :return: pairs (x, y) of tensors of the same shape as the ones
+    returned by getTensorsFromDataFile, with batchSize columns
+    (except possibly the last one).
+    """
+    bufferSize = max(shuffleBufferSize, batchSize)
+    nbCols = nbFeatures + 1
+    buffer = numpy.empty((nbCols, 0), dtype=numpy.float32)
+
+    def toTensors(data):
+        return (torch.from_numpy(data[:-1]), torch.from_numpy(data[-1:]))
+
+    def flush(buffer, last):
+        if shuffleBufferSize > 0:
+            buffer = buffer[:, numpy.random.permutation(buffer.shape[1])]
+        nbBatches = buffer.shape[1] // batchSize
+        if last and buffer.shape[1] % batchSize != 0:
+            nbBatches += 1
+        for i in range(nbBatches):
+            yield toTensors(buffer[:, i*batchSize:(i+1)*batchSize])
+        return buffer[:, nbBatches*batchSize:]
+
+    for chunk in iterateChunks(path, nbCols, numpy.float32, chunkSize):
+        #float64 binary files are converted to the type of the models
+        chunk = chunk.astype(numpy.float32, copy=False)
+        buffer = numpy.concatenate( (buffer, chunk), axis=1 )
+        if buffer.shape[1] >= bufferSize:
+            buffer = yield from flush(buffer, False)
+    yield from flush(buffer, True)
+
+#-------------------------------------------------------------
+def main():
+
+    #parse command line
+    parser = argparse.ArgumentParser(description="program that converts \
+    a text data file (space-delimited fields) into the binary format \
+    that can be memory-mapped by the regression scripts")
+    parser.add_argument("textfile",
+                        help="path to a text data file, e.g. data/line-2-5-noise-5")
+    parser.add_argument("binaryfile",
+                        help="path to the binary file to write")
+    parser.add_argument("-c", "--nbCols",
+                        help="number of fields per line",
+                        type=int, default=2)
+    parser.add_argument("-p", "--precision",
+                        help="floating-point precision of the binary file",
+                        choices=["float32", "float64"],
+                        default="float32")
+    args = parser.parse_args()
+
+    try:
+        data = getArrayFromTextFile(args.textfile, args.nbCols,
+                                    numpy.dtype(args.precision))
+        writeBinaryDataFile(args.binaryfile, data)
+        print("#{} lines written to {}".format(data.shape[1], args.binaryfile))
+    except ValueError:
+        print("Could not convert data; check the number of fields per line")
+        sys.exit(1)
+
+#-------------------------------------------------------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import torch
+
+#-------------------------------------------------------------
+class EnsembleModel(object):
+    """ M one-hidden-layer networks, as UniversalModel, trained
+    together: their weights are stacked in (M,k,d), (M,k,1) and
+    (M,1,k) tensors so that the forward pass of all the members is a single
+    batched matrix product. Members with a smaller hidden layer are
+    padded with zero weights, which stay zero during the training. """
+
+    def __init__(self, hiddenLayerSizes, activationFunction="sigmoid", d=1):
+        """
+        :param: hiddenLayerSizes, list of the sizes of the hidden
+        layer of each member (the same size repeated for an ensemble
+        that only differs by the initialization)
+        :param: activationFunction, either "sigmoid" or "relu"
+        :param: d, number of input features
+        """
+        if activationFunction == "sigmoid":
+            self.sigma = torch.sigmoid
+        elif activationFunction == "relu":
+            self.sigma = torch.relu
+        else:
+            raise ValueError()
+
+        m = len(hiddenLayerSizes)
+        k = max(hiddenLayerSizes)
+        # mask of the hidden units actually used by each member
+        self.mask = torch.zeros(m,k,1)
+        for i, size in enumerate(hiddenLayerSizes):
+            self.mask[i, :size] = 1
+        self.w = (torch.rand(m,k,d) * self.mask).requires_grad_()
+        self.b = (torch.rand(m,k,1) * self.mask).requires_grad_()
+        self.wp = (torch.rand(m,1,k) * self.mask.transpose(1,2)).requires_grad_()
+        # the gradient wrt the padding is zeroed, whatever the optimizer
+        self.w.register_hook(lambda grad: grad * self.mask)
+        self.b.register_hook(lambda grad: grad * self.mask)
+        self.wp.register_hook(lambda grad: grad * self.mask.transpose(1,2))
+        self.losses = torch.zeros(m)
+
+    def forward(self, x):
+        """
+        :param: x, (d,n) tensor of inputs, shared by the members
+        :return: (M,1,n) tensor of the predictions of each member
+        """
+        m = self.w.shape[0]
+        # w x + b for every member, x being broadcast without copy
+        hidden = self.sigma(torch.baddbmm(self.b, self.w, x.expand(m, -1, -1)))
+        return torch.bmm(self.wp, hidden)
+
+    def backward(self, x, y):
+        """ Method that computes the mean square error of every member
+        and the gradient of their sum, each member only depending on
+        its own weights.
+
+        :return: the mean over the members of their loss
+        """
+        self.losses = ((self.forward(x) - y) ** 2).mean(dim=(1,2))
+        self.losses.sum().backward()
+        return self.losses.detach().mean()
+
+    def memberLosses(self):
+        """ Method that returns the loss of each member computed by
+        the last call to backward, as a (M) tensor. """
+        return self.losses.detach()
+
+    def update(self, lr):
+        # disable gradient computation for the update
+        with torch.no_grad():
+            self.w -= lr * self.w.grad
+            self.b -= lr * self.b.grad
+            self.wp -= lr * self.wp.grad
+
+        #reset gradient to zero
+        self.w.grad.zero_()
+        self.b.grad.zero_()
+        self.wp.grad.zero_()
+
+    def parameters(self):
+        return [self.w, self.b, self.wp]
+
+    def evaluate(self, x):
+        """ Method that returns the averaged prediction of the members.
+
+        :return: (1,n) tensor
+        """
+        with torch.no_grad():
+            return self.forward(x).mean(dim=0)
+
+    def __repr__(self):
+        losses = self.losses.detach()
+        return f"(min {losses.min():.4f}, max {losses.max():.4f})"
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+
+import sys
+import argparse
+import json
+import queue
+import threading
+import time
+import torch
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+#-------------------------------------------------------------
+def saveModel(path, model, activationFunction=None):
+    """ Function that saves the parameters of a trained model
+    (LinearModel, UniversalModel, ManualUniversalModel or
+    EnsembleModel) so that it can be served by this program.
+
+    :param: path, path to the file to write
+    :param: model, the trained model
+    :param: activationFunction, "sigmoid" or "relu" for the networks
+    """
+    parameters = [p.detach() for p in model.parameters()]
+    if len(parameters) == 2:
+        kind = "linear"
+    elif parameters[0].dim() == 3:
+        kind = "ensemble"
+    else:
+        kind = "network"
+    torch.save({"kind": kind, "activationFunction": activationFunction,
+                "parameters": parameters}, path)
+
+#-------------------------------------------------------------
+def loadPredictor(path):
+    """ Function that loads a model saved by saveModel.
+
+    :param: path, path to the model file
+    :return: a function mapping a (d,n) tensor of inputs to the
+    (n) tensor of the predicted values; its attribute nbFeatures is d
+    """
+    state = torch.load(path)
+    parameters = state["parameters"]
+    sigma = torch.relu if state["activationFunction"] == "relu" else torch.sigmoid
+
+    if state["kind"] == "linear":
+        w, b = parameters
+        def predict(x):
+            return torch.addmm(b, w, x)[0]
+    elif state["kind"] == "network":
+        w, b, wp = parameters
+        def predict(x):
+            hidden = sigma(torch.addmm(b, w, x))
+            return torch.matmul(wp, hidden)[0]
+    elif state["kind"] == "ensemble":
+        w, b, wp = parameters
+        def predict(x):
+            hidden = sigma(torch.baddbmm(b, w, x.expand(w.shape[0], -1, -1)))
+            return torch.bmm(wp, hidden).mean(dim=0)[0]
+    else:
+        raise ValueError()
+    predict.nbFeatures = w.shape[-1]
+    return predict
+
+#-------------------------------------------------------------
+class RequestBatcher(object):
+    """ Coalesces the requests of concurrent clients: the first
+    request waits at most latency seconds for other ones, then all
+    of them are predicted by a single call to the model. """
+
+    def __init__(self, predict, latency=0.002, maxBatchSize=1 << 16):
+        self.predict = predict
+        self.latency = latency
+        self.maxBatchSize = maxBatchSize
+        self.requests = queue.Queue()
+        self.nbBatches = 0
+        self.nbRequests = 0
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def submit(self, x):
+        """ Method called by the clients, blocking until the result
+        is available.
+
+        :param: x, (d,n) tensor of inputs
+        :return: (n) tensor of predicted values
+        """
+        request = {"x": x, "done": threading.Event()}
+        self.requests.put(request)
+        request["done"].wait()
+        if "error" in request:
+            raise request["error"]
+        return request["y"]
+
+    def run(self):
+        while True:
+            batch = [self.requests.get()]
+            size = batch[0]["x"].shape[1]
+            deadline = time.monotonic() + self.latency
+            while size < self.maxBatchSize:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self.requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(request)
+                size += request["x"].shape[1]
+
+            try:
+                with torch.no_grad():
+                    y = self.predict(torch.cat([r["x"] for r in batch], dim=1))
+                for r, yr in zip(batch, torch.split(y, [r["x"].shape[1] for r in batch])):
+                    r["y"] = yr
+            except Exception as error:
+                for r in batch:
+                    r["error"] = error
+            self.nbBatches += 1
+            self.nbRequests += len(batch)
+            for r in batch:
+                r["done"].set()
+
+#-------------------------------------------------------------
+def getHandler(batcher):
+
+    class PredictionHandler(BaseHTTPRequestHandler):
+        """ POST {"x": [x1, x2, ...]} returns {"y": [y1, y2, ...]},
+        where each sample xi is a number or a list of d numbers """
+
+        def do_POST(self):
+            try:
+                length = int(self.headers["Content-Length"])
+                values = json.loads(self.rfile.read(length))["x"]
+                x = torch.tensor(values, dtype=torch.float32)
+                y = batcher.submit(x.reshape(-1, batcher.predict.nbFeatures).T)
+                body = json.dumps({"y": y.tolist()}).encode()
+                self.send_response(200)
+            except (ValueError, KeyError, TypeError, RuntimeError) as error:
+                body = json.dumps({"error": str(error)}).encode()
+                self.send_response(400)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return PredictionHandler
+
+#-------------------------------------------------------------
+def main():
+
+    #parse command line
+    parser = argparse.ArgumentParser(description="program that serves \
+    the predictions of a regression model saved with the --save option \
+    of linear-regression.py or nonlinear-regression.py")
+    parser.add_argument("modelfile",
+                        help="path to the saved model")
+    parser.add_argument("-p", "--port",
+                        help="port of the HTTP server on localhost; if not \
+                        given, inputs are read from the standard input, \
+                        one request per line (the d features of each \
+                        sample, one sample after the other), and the \
+                        predictions written to the standard output",
+                        type=int)
+    parser.add_argument("-l", "--latency",
+                        help="maximal time in seconds a request waits for \
+                        other ones to be predicted together",
+                        type=float, default=0.002)
+    args = parser.parse_args()
+
+    predict = loadPredictor(args.modelfile)
+
+    if args.port is None:
+        for line in sys.stdin:
+            try:
+                x = torch.tensor([float(v) for v in line.split()])
+                x = x.reshape(-1, predict.nbFeatures).T
+            except (ValueError, RuntimeError):
+                print("Could not convert data")
+                continue
+            with torch.no_grad():
+                print(" ".join(str(v) for v in predict(x).tolist()), flush=True)
+    else:
+        batcher = RequestBatcher(predict, args.latency)
+        server = ThreadingHTTPServer(("localhost", args.port), getHandler(batcher))
+        print(f"# serving on http://localhost:{args.port}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.server_close()
+
+#-------------------------------------------------------------
+if __name__ == "__main__":
+    main()
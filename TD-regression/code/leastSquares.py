@@ -0,0 +1,84 @@
+import numpy
+import torch
+from dataLoader import iterateChunks, getColumnsFromDataFile
+
+#-------------------------------------------------------------
+def getSufficientStatistics(path, nbCols=2):
+    """ Function that scans a data file once, by chunks, and
+    accumulates the sufficient statistics of the least-square
+    problem. Each line contains nbCols-1 features followed by the
+    value to predict; a constant feature equal to one is appended
+    to the features for the intercept.
+
+    :param: path, path to the data file (text or binary)
+    :param: nbCols, number of fields per line
+    :return: a pair (XtX, Xty) of float64 tensors of shapes
+    (nbCols, nbCols) and (nbCols, 1).
+    """
+    XtX = torch.zeros(nbCols, nbCols, dtype=torch.float64)
+    Xty = torch.zeros(nbCols, 1, dtype=torch.float64)
+
+    for chunk in iterateChunks(path, nbCols, numpy.float64):
+        data = torch.from_numpy(chunk).to(torch.float64)
+        features = data[:-1]
+        y = data[-1]
+        s = features.sum(dim=1)
+
+        XtX[:-1, :-1] += torch.matmul(features, features.T)
+        XtX[:-1, -1] += s
+        XtX[-1, :-1] += s
+        XtX[-1, -1] += data.shape[1]
+        Xty[:-1, 0] += torch.matmul(features, y)
+        Xty[-1, 0] += y.sum()
+
+    return (XtX, Xty)
+
+#-------------------------------------------------------------
+def solveByCholesky(XtX, Xty):
+    """ Function that solves the normal equations XtX w = Xty
+    with a Cholesky factorization.
+
+    :param: XtX, symmetric positive definite (d,d) tensor
+    :param: Xty, (d,1) tensor
+    :return: the optimal weights as a (1,d) tensor
+    """
+    L = torch.linalg.cholesky(XtX)
+    return torch.cholesky_solve(Xty, L).T
+
+#-------------------------------------------------------------
+def solveByQR(x, y):
+    """ Function that solves the least-square problem with a QR
+    factorization of the design matrix, which is better conditioned
+    than the normal equations but requires the data in memory.
+
+    :param: x, (d,n) tensor whose columns are the inputs
+    (including the constant feature if needed)
+    :param: y, (1,n) tensor containing the values to predict
+    :return: the optimal weights as a (1,d) tensor
+    """
+    X = x.T.to(torch.float64)
+    Q, R = torch.linalg.qr(X)
+    Qty = torch.matmul(Q.T, y.T.to(torch.float64))
+    return torch.linalg.solve_triangular(R, Qty, upper=True).T
+
+#-------------------------------------------------------------
+def getOptimalWeights(path, method="cholesky", nbCols=2):
+    """ Function that computes the exact least-square fit of the
+    data of a file.
+
+    :param: path, path to the data file (text or binary)
+    :param: method, either "cholesky" (one streamed pass over the
+    data) or "qr" (data loaded in memory)
+    :param: nbCols, number of fields per line
+    :return: the optimal weights, i.e. the coefficients of the
+    features followed by the intercept, as a (1,nbCols) tensor
+    """
+    if method == "cholesky":
+        return solveByCholesky(*getSufficientStatistics(path, nbCols))
+    elif method == "qr":
+        data = getColumnsFromDataFile(path, nbCols, numpy.float64)
+        features = data[:-1]
+        x = torch.cat( (features, torch.ones_like(features[:1])) )
+        return solveByQR(x, data[-1:])
+    else:
+        raise ValueError()
@@ -0,0 +1,113 @@
+import torch
+
+#-------------------------------------------------------------
+class ManualUniversalModel(object):
+    """ Network with one hidden layer, as UniversalModel, whose
+    gradient is derived by hand instead of by autograd. The forward
+    and backward passes of the mean square error are fused in a few
+    matrix products writing into buffers that are allocated once,
+    so that a training step allocates no tensor.
+    """
+
+    def __init__(self, k, activationFunction="sigmoid", d=1):
+        if activationFunction not in ("sigmoid", "relu"):
+            raise ValueError()
+        self.activationFunction = activationFunction
+        self.w = torch.rand(k,d)
+        self.b = torch.rand(k,1)
+        self.wp = torch.rand(1,k)
+        self.capacity = 0
+
+    def allocate(self, n, dtype):
+        # buffers for at most n samples, narrowed for smaller batches
+        k = self.w.shape[0]
+        self.capacity = n
+        self.pre = torch.empty(k, n, dtype=dtype)
+        self.hidden = torch.empty(k, n, dtype=dtype)
+        self.dHidden = torch.empty(k, n, dtype=dtype)
+        self.err = torch.empty(1, n, dtype=dtype)
+        self.loss = torch.empty(1, 1, dtype=dtype)
+        # gradients are stored where the optimizers look for them
+        self.gradW = torch.empty_like(self.w)
+        self.gradB = torch.empty_like(self.b)
+        self.gradWp = torch.empty_like(self.wp)
+        self.w.grad = self.gradW
+        self.b.grad = self.gradB
+        self.wp.grad = self.gradWp
+
+    def forward(self, x):
+        hidden = torch.addmm(self.b, self.w, x)
+        if self.activationFunction == "sigmoid":
+            hidden.sigmoid_()
+        else:
+            hidden.relu_()
+        return torch.matmul(self.wp, hidden)
+
+    def backward(self, x, y):
+        """ Method that computes the mean square error and its
+        gradient wrt w, b and wp, stored in their grad attribute.
+
+        :param: x, (d,n) tensor of inputs
+        :param: y, (1,n) tensor of values to predict
+        :return: the mean square error, as a (1,1) tensor that is
+        overwritten by the next call
+        """
+        n = x.shape[1]
+        if n > self.capacity:
+            self.allocate(n, x.dtype)
+        pre = self.pre[:, :n]
+        hidden = self.hidden[:, :n]
+        dHidden = self.dHidden[:, :n]
+        err = self.err[:, :n]
+
+        # forward pass
+        torch.addmm(self.b, self.w, x, out=pre)
+        if self.activationFunction == "sigmoid":
+            torch.sigmoid(pre, out=hidden)
+        else:
+            torch.clamp(pre, min=0, out=hidden)
+        torch.matmul(self.wp, hidden, out=err)
+        err.sub_(y)
+        torch.matmul(err, err.T, out=self.loss)
+        self.loss.div_(n)
+
+        # backward pass: err becomes the gradient wrt the predictions
+        err.mul_(2/n)
+        torch.matmul(err, hidden.T, out=self.gradWp)
+        torch.matmul(self.wp.T, err, out=dHidden)
+        if self.activationFunction == "sigmoid":
+            # sigma' = sigma (1 - sigma)
+            dHidden.mul_(hidden)
+            dHidden.addcmul_(dHidden, hidden, value=-1)
+        else:
+            # relu' = 1 where the output is positive, 0 elsewhere
+            torch.sign(hidden, out=pre)
+            dHidden.mul_(pre)
+        torch.matmul(dHidden, x.T, out=self.gradW)
+        torch.sum(dHidden, dim=1, keepdim=True, out=self.gradB)
+
+        return self.loss
+
+    def update(self, lr):
+        self.w.add_(self.gradW, alpha=-lr)
+        self.b.add_(self.gradB, alpha=-lr)
+        self.wp.add_(self.gradWp, alpha=-lr)
+
+    def step(self, x, y, lr):
+        """ Method that performs one step of gradient descent
+        on the mean square error.
+
+        :return: the mean square error before the update
+        """
+        loss = self.backward(x, y)
+        self.update(lr)
+        return loss
+
+    def parameters(self):
+        return [self.w, self.b, self.wp]
+
+    def evaluate(self, x):
+        return self.forward(x)
+
+    def __repr__(self):
+        return f"({self.w[0][0]:.4f}, {self.b[0][0]:.4f})"
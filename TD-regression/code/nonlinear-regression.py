@@ -3,70 +3,50 @@
 import sys
 import argparse
 import torch
+from dataLoader import getTensorsFromDataFile
+from training import trainByFullBatch, trainByMiniBatches
+from training import EarlyStopping, Checkpoint
+from optimizers import getOptimizer, getSchedule
+from inference import saveModel
+from manualGradient import ManualUniversalModel
+from ensemble import EnsembleModel
 # see for help about pytorch
 # https://pytorch.org/tutorials/beginner/basics/tensorqs_tutorial.html
 
-#-------------------------------------------------------------
-def getTensorsFromDataFile(path):
-    """ Function that reads a file composed of lines containing
-    two fields and returns a list containing the values of the 
-    two fields.
- 
-    :param: path, path to the file to read
-    :return: a list of tuples (x,y) where x and y are floats.
-    """
-
-    # read file
-    delimiter = " "
-    dataFile = open(path,'r')
-
-    xAsList = []
-    yAsList = []
-    for line in dataFile.readlines():
-        fields = line.split(delimiter)
-        if len(fields) != 2:
-            raise ValueError
-        xAsList.append( float(fields[0]) )
-        yAsList.append( float(fields[1]) )
-
-    dataFile.close()
-
-    # create and return tensors
-    xData = torch.tensor(xAsList)
-    xOnes = torch.ones_like(xData)
-    x = torch.stack( (xData, xOnes) )
-
-    y = torch.tensor([yAsList])
-    
-    return (x, y)
-
 #-------------------------------------------------------------
 class UniversalModel(object):
 
-    def __init__(self, k):
-        self.w = torch.rand(k,2, requires_grad=True)
+    def __init__(self, k, d=1):
+        self.w = torch.rand(k,d, requires_grad=True)
+        self.b = torch.rand(k,1, requires_grad=True)
         self.wp = torch.rand(1,k, requires_grad=True)
 
     def forward(self, x):
-        hidden = sigma(torch.matmul(self.w, x))
+        # w x + b, without materializing a column of ones in x
+        hidden = sigma(torch.addmm(self.b, self.w, x))
         return torch.matmul(self.wp, hidden)
 
     def update(self, lr):
         # disable gradient computation for the update
         with torch.no_grad():
             self.w -= lr * self.w.grad
+            self.b -= lr * self.b.grad
             self.wp -= lr * self.wp.grad
 
         #reset gradient to zero
         self.w.grad.zero_() 
+        self.b.grad.zero_()
         self.wp.grad.zero_() 
 
+    def parameters(self):
+        return [self.w, self.b, self.wp]
+
     def evaluate(self, x):
         with torch.no_grad():
             return self.forward(x)    
 
     def __repr__(self):
-        return f"({self.w[0][0]:.4f}, {self.w[0][1]:.4f})"
+        return f"({self.w[0][0]:.4f}, {self.b[0][0]:.4f})"
 
 #-------------------------------------------------------------
 def mse(y_pred, y_true):
@@ -81,13 +61,26 @@ if __name__ == "__main__":
     the regression line that fits the data points")
     parser.add_argument("datafile",
                         help="path to a data file containing two fields \
-                        per line: x y")
+                        per line: x y (or d+1 fields: x1 ... xd y), or \
+                        to its binary version written by dataLoader.py")
+    parser.add_argument("-d", "--nbFeatures",
+                        help="number of input fields per line",
+                        type=int, default=1)
     parser.add_argument("-n", "--nbEpochs",   
                         help="maximal number of epochs",
                         type=int, default=10)
     parser.add_argument("-r", "--learningRate",   
                         help="learning rate",
                         type=float, default=0.01)
+    parser.add_argument("-b", "--batchSize",
+                        help="number of samples per update, the data file \
+                        being streamed by chunks (0 for full-batch \
+                        gradient descent on the data loaded in memory)",
+                        type=int, default=0)
+    parser.add_argument("-s", "--shuffleBufferSize",
+                        help="number of samples shuffled together in \
+                        mini-batch mode (0 for no shuffling)",
+                        type=int, default=0)
     parser.add_argument("-k", "--hiddenLayerSize",   
                         help="size of the hidden layer",
                         type=int, default=1)
@@ -95,6 +88,54 @@ if __name__ == "__main__":
                         help="activation function",
                         choices=["sigmoid", "relu"],
                         default="sigmoid")
+    parser.add_argument("-g", "--manualGradient",
+                        help="compute the gradient by hand instead of \
+                        by autograd, in preallocated buffers",
+                        action="store_true")
+    parser.add_argument("-o", "--optimizer",
+                        help="update rule of the parameters",
+                        choices=["sgd", "decreasing", "momentum", "rmsprop", "adam"],
+                        default="sgd")
+    parser.add_argument("--decayFactor",
+                        help="decay factor of momentum and rmsprop",
+                        type=float, default=0.9)
+    parser.add_argument("--schedule",
+                        help="learning rate schedule",
+                        choices=["constant", "step", "cosine"],
+                        default="constant")
+    parser.add_argument("-e", "--ensembleSize",
+                        help="number of networks trained together by \
+                        batched matrix products, the prediction being \
+                        their average (0 for a single network)",
+                        type=int, default=0)
+    parser.add_argument("-t", "--tolerance",
+                        help="stop when the relative improvement of the \
+                        loss is below this tolerance (0 to disable)",
+                        type=float, default=0.)
+    parser.add_argument("--gradientTolerance",
+                        help="stop when the norm of the gradient is below \
+                        this tolerance (0 to disable)",
+                        type=float, default=0.)
+    parser.add_argument("-p", "--patience",
+                        help="number of loss evaluations without enough \
+                        improvement before stopping",
+                        type=int, default=1)
+    parser.add_argument("--checkPeriod",
+                        help="number of epochs between two evaluations \
+                        of the loss (display and convergence test)",
+                        type=int, default=10)
+    parser.add_argument("-c", "--checkpoint",
+                        help="path to a file where the training is \
+                        periodically saved")
+    parser.add_argument("--checkpointPeriod",
+                        help="number of epochs between two checkpoints",
+                        type=int, default=100)
+    parser.add_argument("--resume",
+                        help="resume the training from the checkpoint",
+                        action="store_true")
+    parser.add_argument("--save",
+                        help="path to a file where the trained model is \
+                        saved, to be served by inference.py")
     parser.add_argument("-v", "--visualize",
                         help="show the scatter plot of the data",
                         action="store_true")
@@ -107,28 +148,55 @@ if __name__ == "__main__":
         sigma = torch.relu 
 
     #-------------------------------------------------------------
-    # read data        
-    x, y = getTensorsFromDataFile(args.datafile)
+    # learn model by gradient descent
+    if args.ensembleSize > 0:
+        model = EnsembleModel([args.hiddenLayerSize] * args.ensembleSize,
+                              args.activationFunction, args.nbFeatures)
+    elif args.manualGradient:
+        model = ManualUniversalModel(args.hiddenLayerSize,
+                                     args.activationFunction,
+                                     args.nbFeatures)
+    else:
+        model = UniversalModel(args.hiddenLayerSize, args.nbFeatures)
+    nbEpochs = args.nbEpochs
+
+    optimizer = getOptimizer(args.optimizer, model.parameters(),
+                             args.decayFactor)
+    schedule = getSchedule(args.schedule, args.learningRate, nbEpochs)
+    stopping = EarlyStopping(args.tolerance, args.gradientTolerance,
+                             args.patience)
+    checkpoint = None
+    if args.checkpoint:
+        checkpoint = Checkpoint(args.checkpoint, args.checkpointPeriod,
+                                args.resume)
+    options = dict(optimizer=optimizer, schedule=schedule,
+                   stopping=stopping, checkpoint=checkpoint,
+                   checkPeriod=args.checkPeriod)
+
+    if args.batchSize > 0:
+        # stream mini-batches from the data file
+        trainByMiniBatches(model, args.datafile, mse, args.learningRate,
+                           nbEpochs, args.batchSize,
+                           args.shuffleBufferSize, args.nbFeatures,
+                           **options)
+    else:
+        # read data
+        x, y = getTensorsFromDataFile(args.datafile, args.nbFeatures)
+        trainByFullBatch(model, x, y, mse, args.learningRate,
+                         nbEpochs, **options)
+
+    if args.ensembleSize > 0:
+        print("# member losses:", model.memberLosses().tolist())
+
+    if args.save:
+        saveModel(args.save, model, args.activationFunction)
 
-    #-------------------------------------------------------------
-    # learn model by gradient descent        
-    model = UniversalModel(args.hiddenLayerSize)
-    
-    for epoch in range(args.nbEpochs):
-
-        y_pred = model.forward(x)
-        loss = mse(y_pred, y)
-        loss.backward() #backpropagation to compute the gradient
-        model.update(args.learningRate) #update model paramaters
-
-        # display
-        if epoch % 10 == 0:
-            print(f"# {epoch}: Loss = {loss.item():.4f}")
-            
     #-------------------------------------------------------------
     # learning by gradient descent        
     if args.visualize: 
 
+        if args.batchSize > 0:
+            x, y = getTensorsFromDataFile(args.datafile, args.nbFeatures)
         y_pred = model.evaluate(x)
         
         import matplotlib.pyplot as plt
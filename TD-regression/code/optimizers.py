@@ -0,0 +1,184 @@
+import math
+import torch
+
+# Each optimizer updates in place a list of parameters (tensors whose
+# gradient is stored in their grad attribute), then resets their gradient
+# to zero, exactly as the update method of the models does for plain
+# gradient descent. The state of the optimizers is preallocated, so
+# that an update allocates no tensor.
+
+#-------------------------------------------------------------
+class Optimizer(object):
+
+    # names of the attributes holding the state of the optimizer,
+    # lists of tensors of the same shapes as the parameters
+    stateNames = []
+
+    def __init__(self, parameters):
+        self.parameters = list(parameters)
+        self.counter = 0
+
+    def update(self, lr):
+        self.counter += 1
+        # disable gradient computation for the update
+        with torch.no_grad():
+            self.updateParameters(lr)
+
+        #reset gradient to zero
+        for p in self.parameters:
+            p.grad.zero_()
+
+    def updateParameters(self, lr):
+        """ Method that moves the parameters against their gradient,
+        by the given step: the update of plain gradient descent,
+        overridden by the other optimizers. """
+        for p in self.parameters:
+            p.add_(p.grad, alpha=-lr)
+
+    def state(self):
+        state = {"counter": self.counter}
+        for name in self.stateNames:
+            state[name] = getattr(self, name)
+        return state
+
+    def loadState(self, state):
+        self.counter = state["counter"]
+        for name in self.stateNames:
+            for t, saved in zip(getattr(self, name), state[name]):
+                t.copy_(saved)
+
+#-------------------------------------------------------------
+class GivenStep(Optimizer):
+    """ Plain gradient descent, the default update of Optimizer. """
+
+#-------------------------------------------------------------
+class DecreasingStep(Optimizer):
+    """ Step divided by the iteration number and normalized by the
+    norm of the whole gradient. """
+
+    def updateParameters(self, lr):
+        norm = math.sqrt(sum(torch.sum(p.grad**2).item() for p in self.parameters))
+        if norm > 0:
+            for p in self.parameters:
+                p.add_(p.grad, alpha=-lr / (self.counter * norm))
+
+#-------------------------------------------------------------
+class Momentum(Optimizer):
+
+    stateNames = ["variations"]
+
+    def __init__(self, parameters, decayFactor=0.9):
+        super().__init__(parameters)
+        self.alpha = decayFactor
+        self.variations = [torch.zeros_like(p) for p in self.parameters]
+
+    def updateParameters(self, lr):
+        for p, v in zip(self.parameters, self.variations):
+            # v = alpha v + lr grad, p = p - v
+            v.mul_(self.alpha).add_(p.grad, alpha=lr)
+            p.sub_(v)
+
+#-------------------------------------------------------------
+class RMSProp(Optimizer):
+
+    stateNames = ["terms"]
+
+    def __init__(self, parameters, forgettingFactor=0.9, eps=1e-8):
+        super().__init__(parameters)
+        self.alpha = forgettingFactor
+        self.eps = eps
+        self.terms = [torch.zeros_like(p) for p in self.parameters]
+        self.denominators = [torch.empty_like(p) for p in self.parameters]
+
+    def updateParameters(self, lr):
+        for p, t, d in zip(self.parameters, self.terms, self.denominators):
+            # t = alpha t + (1 - alpha) grad^2, p = p - lr grad / sqrt(t)
+            t.mul_(self.alpha).addcmul_(p.grad, p.grad, value=1-self.alpha)
+            torch.sqrt(t, out=d).add_(self.eps)
+            p.addcdiv_(p.grad, d, value=-lr)
+
+#-------------------------------------------------------------
+class Adam(Optimizer):
+
+    stateNames = ["means", "variances"]
+
+    def __init__(self, parameters, beta1=0.9, beta2=0.999, eps=1e-8):
+        super().__init__(parameters)
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.eps = eps
+        self.means = [torch.zeros_like(p) for p in self.parameters]
+        self.variances = [torch.zeros_like(p) for p in self.parameters]
+        self.denominators = [torch.empty_like(p) for p in self.parameters]
+
+    def updateParameters(self, lr):
+        # bias corrections of the moving averages
+        c1 = 1 - self.beta1**self.counter
+        c2 = 1 - self.beta2**self.counter
+        for p, m, v, d in zip(self.parameters, self.means,
+                              self.variances, self.denominators):
+            m.mul_(self.beta1).add_(p.grad, alpha=1-self.beta1)
+            v.mul_(self.beta2).addcmul_(p.grad, p.grad, value=1-self.beta2)
+            torch.sqrt(v, out=d).div_(math.sqrt(c2)).add_(self.eps)
+            p.addcdiv_(m, d, value=-lr / c1)
+
+#-------------------------------------------------------------
+def getOptimizer(name, parameters, decayFactor=0.9):
+    """ Function that builds an optimizer from its name.
+
+    :param: name, one of "sgd", "decreasing", "momentum", "rmsprop", "adam"
+    :param: parameters, list of tensors to optimize
+    :param: decayFactor, decay factor of momentum and rmsprop
+    :return: the optimizer
+    """
+    if name == "sgd":
+        return GivenStep(parameters)
+    elif name == "decreasing":
+        return DecreasingStep(parameters)
+    elif name == "momentum":
+        return Momentum(parameters, decayFactor)
+    elif name == "rmsprop":
+        return RMSProp(parameters, decayFactor)
+    elif name == "adam":
+        return Adam(parameters)
+    else:
+        raise ValueError()
+
+#-------------------------------------------------------------
+def constantSchedule(lr):
+    def f(epoch):
+        return lr
+    return f
+
+#-------------------------------------------------------------
+def stepSchedule(lr, period, factor=0.5):
+    def f(epoch):
+        return lr * factor**(epoch // period)
+    return f
+
+#-------------------------------------------------------------
+def cosineSchedule(lr, nbEpochs, minLr=0.):
+    def f(epoch):
+        return minLr + 0.5*(lr - minLr)*(1 + math.cos(math.pi * epoch / nbEpochs))
+    return f
+
+#-------------------------------------------------------------
+def getSchedule(name, lr, nbEpochs, period=None):
+    """ Function that builds a learning rate schedule, i.e. a function
+    that returns the learning rate of a given epoch.
+
+    :param: name, one of "constant", "step", "cosine"
+    :param: lr, initial learning rate
+    :param: nbEpochs, number of epochs
+    :param: period, number of epochs between two halvings of the
+    learning rate for the step schedule (default: a tenth of nbEpochs)
+    :return: the schedule
+    """
+    if name == "constant":
+        return constantSchedule(lr)
+    elif name == "step":
+        return stepSchedule(lr, period or max(1, nbEpochs // 10))
+    elif name == "cosine":
+        return cosineSchedule(lr, nbEpochs)
+    else:
+        raise ValueError()
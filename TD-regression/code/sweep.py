@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import argparse
+import itertools
+import random
+import math
+import time
+import csv
+import json
+import torch
+import torch.multiprocessing as multiprocessing
+from dataLoader import getTensorsFromDataFile
+from manualGradient import ManualUniversalModel
+from optimizers import getOptimizer
+from training import trainByFullBatch
+
+#-------------------------------------------------------------
+# data set shared by the worker processes
+sharedData = None
+
+def initWorker(x, y):
+    global sharedData
+    sharedData = (x, y)
+    # one thread per process, parallelism comes from the pool
+    torch.set_num_threads(1)
+
+#-------------------------------------------------------------
+def runConfiguration(config):
+    """ Function that trains a one-hidden-layer network for a given
+    configuration on the shared data set.
+
+    :param: config, dict with keys hiddenLayerSize, learningRate,
+    activationFunction, optimizer, nbEpochs, nbFeatures and seed
+    :return: the configuration completed with the final loss and
+    the wall time of the training
+    """
+    x, y = sharedData
+    torch.manual_seed(config["seed"])
+
+    start = time.perf_counter()
+    model = ManualUniversalModel(config["hiddenLayerSize"],
+                                 config["activationFunction"],
+                                 config["nbFeatures"])
+    optimizer = getOptimizer(config["optimizer"], model.parameters())
+    trainByFullBatch(model, x, y, None, config["learningRate"],
+                     config["nbEpochs"], optimizer=optimizer,
+                     checkPeriod=config["nbEpochs"], verbose=False)
+    loss = model.backward(x, y).item()
+    wallTime = time.perf_counter() - start
+
+    return dict(config, loss=loss, time=wallTime)
+
+#-------------------------------------------------------------
+def getGrid(args):
+    """ Function that lists every combination of the given values. """
+    return [ {"hiddenLayerSize": k, "learningRate": lr,
+              "activationFunction": f}
+             for k, lr, f in itertools.product(args.hiddenLayerSizes,
+                                               args.learningRates,
+                                               args.activationFunctions) ]
+
+#-------------------------------------------------------------
+def getRandomConfigurations(args, rng):
+    """ Function that draws configurations at random: the learning
+    rate is log-uniform between the extreme given values, the other
+    parameters are taken among the given values. """
+    logMin = math.log(min(args.learningRates))
+    logMax = math.log(max(args.learningRates))
+    return [ {"hiddenLayerSize": rng.choice(args.hiddenLayerSizes),
+              "learningRate": math.exp(rng.uniform(logMin, logMax)),
+              "activationFunction": rng.choice(args.activationFunctions)}
+             for _ in range(args.nbSamples) ]
+
+#-------------------------------------------------------------
+def writeResults(path, results):
+    if path.endswith(".json"):
+        with open(path, 'w') as resultFile:
+            json.dump(results, resultFile, indent=1)
+    else:
+        with open(path, 'w', newline='') as resultFile:
+            writer = csv.DictWriter(resultFile, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+
+#-------------------------------------------------------------
+def main():
+
+    #parse command line
+    parser = argparse.ArgumentParser(description="program that trains \
+    the network of nonlinear-regression.py for many hyperparameter \
+    configurations in parallel, the data file being read only once")
+    parser.add_argument("datafile",
+                        help="path to a data file containing two fields \
+                        per line: x y (or d+1 fields: x1 ... xd y), or \
+                        to its binary version written by dataLoader.py")
+    parser.add_argument("-d", "--nbFeatures",
+                        help="number of input fields per line",
+                        type=int, default=1)
+    parser.add_argument("-m", "--mode",
+                        help="grid: every combination of the given values, \
+                        random: configurations drawn at random",
+                        choices=["grid", "random"],
+                        default="grid")
+    parser.add_argument("-k", "--hiddenLayerSizes",
+                        help="sizes of the hidden layer",
+                        type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("-r", "--learningRates",
+                        help="learning rates",
+                        type=float, nargs="+", default=[0.001, 0.01, 0.1])
+    parser.add_argument("-f", "--activationFunctions",
+                        help="activation functions",
+                        choices=["sigmoid", "relu"], nargs="+",
+                        default=["sigmoid", "relu"])
+    parser.add_argument("-o", "--optimizer",
+                        help="update rule of the parameters",
+                        choices=["sgd", "decreasing", "momentum", "rmsprop", "adam"],
+                        default="sgd")
+    parser.add_argument("-n", "--nbEpochs",
+                        help="number of epochs per configuration",
+                        type=int, default=100)
+    parser.add_argument("-s", "--nbSamples",
+                        help="number of configurations in random mode",
+                        type=int, default=20)
+    parser.add_argument("--seed",
+                        help="seed of the random generators",
+                        type=int, default=0)
+    parser.add_argument("-j", "--nbWorkers",
+                        help="number of worker processes",
+                        type=int, default=os.cpu_count())
+    parser.add_argument("-w", "--output",
+                        help="path to the result table (.csv or .json)",
+                        default="sweep.csv")
+    args = parser.parse_args()
+
+    try:
+        x, y = getTensorsFromDataFile(args.datafile, args.nbFeatures)
+    except ValueError:
+        print("Could not convert data; check the number of fields per line")
+        sys.exit(1)
+    # read once, then shared by the workers without copy
+    x.share_memory_()
+    y.share_memory_()
+
+    rng = random.Random(args.seed)
+    if args.mode == "grid":
+        configs = getGrid(args)
+    else:
+        configs = getRandomConfigurations(args, rng)
+    for i, config in enumerate(configs):
+        config.update(optimizer=args.optimizer, nbEpochs=args.nbEpochs,
+                      nbFeatures=args.nbFeatures, seed=args.seed + i)
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.nbWorkers, initWorker, (x, y)) as pool:
+        results = []
+        for result in pool.imap_unordered(runConfiguration, configs):
+            print("# k={hiddenLayerSize} lr={learningRate:.4g} "
+                  "f={activationFunction}: Loss = {loss:.4f} "
+                  "({time:.2f}s)".format(**result))
+            results.append(result)
+    print("# {} configurations in {:.2f}s".format(len(results),
+                                                 time.perf_counter() - start))
+
+    results.sort(key=lambda r: r["loss"] if r["loss"] == r["loss"] else math.inf)
+    writeResults(args.output, results)
+
+#-------------------------------------------------------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import math
+import os
+import torch
+from dataLoader import iterateBatches
+
+#-------------------------------------------------------------
+def gradientNorm(parameters):
+    return math.sqrt(sum(torch.sum(p.grad**2).item() for p in parameters))
+
+#-------------------------------------------------------------
+class EarlyStopping(object):
+    """ Convergence test performed every time the loss is evaluated,
+    on the relative improvement of the loss and on the norm of the
+    gradient. """
+
+    def __init__(self, tolerance=0., gradientTolerance=0., patience=1):
+        """
+        :param: tolerance, minimal relative improvement of the loss
+        between two evaluations (0 to disable the test)
+        :param: gradientTolerance, minimal norm of the gradient
+        (0 to disable the test)
+        :param: patience, number of consecutive evaluations without
+        enough improvement before stopping
+        """
+        self.tolerance = tolerance
+        self.gradientTolerance = gradientTolerance
+        self.patience = patience
+        self.lastLoss = None
+        self.counter = 0
+
+    def hasConverged(self, loss, gradientNorm=None):
+        """ Method that tells whether the training can stop.
+
+        :param: loss, current loss as a float
+        :param: gradientNorm, current norm of the gradient
+        :return: True if the training has converged
+        """
+        if self.gradientTolerance > 0 and gradientNorm is not None:
+            if gradientNorm < self.gradientTolerance:
+                return True
+
+        if self.tolerance > 0 and self.lastLoss is not None:
+            improvement = (self.lastLoss - loss) / max(abs(self.lastLoss), 1e-30)
+            if improvement < self.tolerance:
+                self.counter += 1
+            else:
+                self.counter = 0
+        self.lastLoss = loss
+        return self.counter >= self.patience
+
+    def state(self):
+        return {"lastLoss": self.lastLoss, "counter": self.counter}
+
+    def loadState(self, state):
+        self.lastLoss = state["lastLoss"]
+        self.counter = state["counter"]
+
+#-------------------------------------------------------------
+class Checkpoint(object):
+    """ Periodic save of the parameters of the model and of the state
+    of the training to a file, from which the training can resume. """
+
+    def __init__(self, path, period=100, resume=False):
+        """
+        :param: path, path to the checkpoint file
+        :param: period, number of epochs between two saves
+        :param: resume, whether the training resumes from the file
+        """
+        self.path = path
+        self.period = period
+        self.resume = resume
+
+    def save(self, epoch, model, optimizer, stopping):
+        state = {"epoch": epoch,
+                 "parameters": [p.detach() for p in model.parameters()]}
+        if optimizer is not None:
+            state["optimizer"] = optimizer.state()
+        if stopping is not None:
+            state["stopping"] = stopping.state()
+        # write then rename, so that a preemption never leaves
+        # a partially written checkpoint
+        temporaryPath = self.path + ".tmp"
+        torch.save(state, temporaryPath)
+        os.replace(temporaryPath, self.path)
+
+    def load(self, model, optimizer, stopping):
+        """ Method that restores the state saved in the file.
+
+        :return: the epoch at which the training resumes
+        """
+        state = torch.load(self.path)
+        with torch.no_grad():
+            for p, saved in zip(model.parameters(), state["parameters"]):
+                p.copy_(saved)
+        if optimizer is not None:
+            optimizer.loadState(state["optimizer"])
+        if stopping is not None and "stopping" in state:
+            stopping.loadState(state["stopping"])
+        return state["epoch"] + 1
+
+#-------------------------------------------------------------
+def train(model, getBatches, loss, lr, nbEpochs,
+          optimizer=None, schedule=None, stopping=None,
+          checkpoint=None, checkPeriod=10, verbose=True):
+    """ Function that learns the parameters of a model by gradient
+    descent. The loss is only brought back to the host every
+    checkPeriod epochs, to display it and test the convergence.
+
+    :param: model, a model providing forward, update and parameters
+    methods, and possibly a backward method computing its own loss
+    and gradient
+    :param: getBatches, function returning the pairs (x, y) of an epoch
+    :param: loss, function of the predictions and the true values
+    :param: lr, learning rate
+    :param: nbEpochs, maximal number of passes over the data
+    :param: optimizer, update rule used instead of the model update
+    :param: schedule, function returning the learning rate of an epoch
+    (used instead of lr)
+    :param: stopping, convergence test (EarlyStopping)
+    :param: checkpoint, periodic save of the training (Checkpoint)
+    :param: checkPeriod, number of epochs between two evaluations
+    of the loss
+    :param: verbose, whether the loss is displayed
+    :return: the mean loss over the last epoch
+    """
+    updater = model if optimizer is None else optimizer
+    startEpoch = 0
+    if checkpoint is not None and checkpoint.resume \
+       and os.path.exists(checkpoint.path):
+        startEpoch = checkpoint.load(model, optimizer, stopping)
+        if verbose:
+            print(f"# resume at epoch {startEpoch}")
+
+    testGradient = stopping is not None and stopping.gradientTolerance > 0
+    meanLoss = None
+    for epoch in range(startEpoch, nbEpochs):
+
+        epochLr = lr if schedule is None else schedule(epoch)
+        isChecked = (epoch % checkPeriod == 0) or (epoch == nbEpochs-1)
+
+        #accumulated as a tensor to avoid a host sync per batch
+        epochLoss = torch.zeros(())
+        nbSamples = 0
+        norm = None
+        for x, y in getBatches():
+            if hasattr(model, "backward"):
+                batchLoss = model.backward(x, y)
+            else:
+                y_pred = model.forward(x)
+                batchLoss = loss(y_pred, y)
+                batchLoss.backward() #backpropagation to compute the gradient
+
+            # gradient of the last batch, before being reset by the update
+            if isChecked and testGradient:
+                norm = gradientNorm(model.parameters())
+            updater.update(epochLr) #update model paramaters
+
+            epochLoss += batchLoss.detach().reshape(()) * y.shape[1]
+            nbSamples += y.shape[1]
+
+        meanLoss = epochLoss / max(nbSamples, 1)
+
+        converged = False
+        if isChecked:
+            # display
+            if verbose:
+                print(f"# {epoch}: Loss = {meanLoss.item():.4f}", end=", ")
+                print(model)
+            if stopping is not None:
+                converged = stopping.hasConverged(meanLoss.item(), norm)
+
+        if checkpoint is not None and \
+           (epoch % checkpoint.period == 0 or converged or epoch == nbEpochs-1):
+            checkpoint.save(epoch, model, optimizer, stopping)
+
+        if converged:
+            if verbose:
+                print(f"# converged at epoch {epoch}")
+            break
+
+    return meanLoss
+
+#-------------------------------------------------------------
+def trainByFullBatch(model, x, y, loss, lr, nbEpochs, **options):
+    """ Function that learns the parameters of a model by gradient
+    descent on the whole data set, held in memory. See train for
+    the options.
+
+    :param: x, (d,n) tensor of inputs
+    :param: y, (1,n) tensor of values to predict
+    """
+    return train(model, lambda: [(x, y)], loss, lr, nbEpochs, **options)
+
+#-------------------------------------------------------------
+def trainByMiniBatches(model, path, loss, lr, nbEpochs,
+                       batchSize, shuffleBufferSize=0, nbFeatures=1,
+                       **options):
+    """ Function that learns the parameters of a model by mini-batch
+    gradient descent, streaming the data file at each epoch so that
+    the whole data set never has to fit in memory. See train for
+    the options.
+
+    :param: path, path to the data file (text or binary)
+    :param: batchSize, number of samples per parameter update
+    :param: shuffleBufferSize, number of samples shuffled together
+    :param: nbFeatures, number of input fields per line
+    """
+    def getBatches():
+        return iterateBatches(path, batchSize, shuffleBufferSize, nbFeatures)
+    return train(model, getBatches, loss, lr, nbEpochs, **options)
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+
+import sys
+import argparse
+from collections import OrderedDict
+import numpy
+from perceptron import getArrayFromDataFile
+
+# number of samples whose outputs are predicted at once
+PREDICTION_BLOCK_SIZE = 4096
+
+#-------------------------------------------------------------
+def getKernel(a, b, kernel="rbf", gamma=1., degree=3, coef0=1.):
+    """ Function that computes the kernel of every pair of rows of a
+    and b:
+    - rbf: exp(-gamma |a-b|^2),
+    - polynomial: (gamma a.b + coef0)^degree.
+
+    :param: a, (m,d) numpy array
+    :param: b, (n,d) numpy array
+    :return: (m,n) numpy array
+    """
+    products = a @ b.T
+    if kernel == "rbf":
+        d2 = (a*a).sum(axis=1)[:,None] + (b*b).sum(axis=1)[None,:] - 2*products
+        return numpy.exp(-gamma * numpy.maximum(d2, 0.))
+    if kernel == "polynomial":
+        return (gamma * products + coef0) ** degree
+    raise ValueError("unknown kernel {}".format(kernel))
+
+#-------------------------------------------------------------
+class KernelRowCache(object):
+    """ Bounded cache of the rows of the Gram matrix of the learning
+    set: the row of the i-th sample, its kernel with every sample, is
+    computed on demand and the least recently used row is dropped when
+    the cache is full, so that the memory is capacity*n floats instead
+    of n^2. """
+
+    def __init__(self, x, capacity, **kernelParameters):
+        self.x = x
+        self.capacity = capacity
+        self.kernelParameters = kernelParameters
+        self.rows = OrderedDict()
+        self.nbHits = 0
+        self.nbMisses = 0
+
+    def getRow(self, i):
+        """
+        :return: (n) numpy array of the kernels of the i-th sample
+        with every sample
+        """
+        row = self.rows.get(i)
+        if row is not None:
+            self.rows.move_to_end(i)
+            self.nbHits += 1
+            return row
+        self.nbMisses += 1
+        row = getKernel(self.x[i:i+1], self.x, **self.kernelParameters)[0]
+        if self.capacity > 0:
+            if len(self.rows) >= self.capacity:
+                self.rows.popitem(last=False)
+            self.rows[i] = row
+        return row
+
+#-------------------------------------------------------------
+class KernelPerceptron(object):
+    """ Perceptron in the feature space of a kernel: the weights are a
+    combination of the samples misclassified during the learning, the
+    support vectors, so that the separator can be non-linear in the
+    input space.
+
+    The scores of all the samples are kept up to date during the
+    learning, each mistake adding a row of the Gram matrix, taken from
+    a bounded LRU cache. With a budget, the number of support vectors
+    is bounded: past the budget, the oldest support vector is removed,
+    as in the Forgetron of Dekel, Shalev-Shwartz and Singer (without
+    its shrinking of the coefficients). On noisy data, the perceptron
+    learnt with a budget changes a lot from one epoch to the next, so
+    that the pocket is worth using. """
+
+    def __init__(self, kernel="rbf", gamma=1., degree=3, coef0=1.,
+                 budget=None, cacheSize=1024):
+        self.kernelParameters = {"kernel": kernel, "gamma": gamma,
+                                 "degree": degree, "coef0": coef0}
+        self.budget = budget
+        self.cacheSize = cacheSize
+        self.supportVectors = None # (k,d) numpy array
+        self.coefficients = None # (k) numpy array
+        self.bias = 1.0
+        self.cache = None
+
+    def learning(self, x, y, learningRate=0.5, verbose=False, maxEpochs=None,
+                 pocket=False):
+        """ Method that learns the support vectors, their coefficients
+        and the bias from a given learning set.
+
+        :param: x, (n,d) numpy array of the inputs
+        :param: y, (n) numpy array of the outputs, 1 or -1
+        :param: learningRate, learning rate
+        :param: verbose, print the number of mistakes of each epoch
+        :param: maxEpochs, maximal number of epochs, None for no limit
+        :param: pocket, keep the support vectors with the fewest
+        training errors at the end of an epoch, rather than the last ones
+        :return: True if the last epoch made no mistake
+        """
+        x = numpy.ascontiguousarray(x, dtype=float)
+        y = numpy.asarray(y, dtype=float)
+        n = x.shape[0]
+        self.cache = KernelRowCache(x, self.cacheSize, **self.kernelParameters)
+        # coefficient of each support vector, by index, the oldest first
+        alphas = {}
+        b = 1.0
+        scores = numpy.zeros(n)
+        best = (dict(alphas), b, numpy.count_nonzero(y * b < 0))
+
+        c = 1
+        flagCont = True
+        while flagCont and (maxEpochs is None or c <= maxEpochs):
+            nbMistakes = 0
+            i = 0
+            while i < n:
+                mistakes = numpy.flatnonzero(y[i:] * (scores[i:] + b) < 0)
+                if mistakes.shape[0] == 0:
+                    break
+                i += mistakes[0]
+                row = self.cache.getRow(i)
+                scores += learningRate * y[i] * row
+                b += learningRate * y[i]
+                alphas[i] = alphas.get(i, 0.) + learningRate
+                nbMistakes += 1
+
+                if self.budget is not None and len(alphas) > self.budget:
+                    # the oldest support vector is removed, with its
+                    # update of the bias
+                    j = next(iter(alphas))
+                    alpha = alphas.pop(j)
+                    scores -= alpha * y[j] * self.cache.getRow(j)
+                    b -= alpha * y[j]
+                i += 1
+
+            if verbose:
+                print("#{} {} mistakes".format(c, nbMistakes))
+            flagCont = nbMistakes > 0
+            if pocket:
+                #the scores are the ones of the current perceptron
+                nbErrors = numpy.count_nonzero(y * (scores + b) < 0)
+                if nbErrors < best[2]:
+                    best = (dict(alphas), b, nbErrors)
+            c += 1
+
+        if pocket:
+            alphas, b, _ = best
+        indices = numpy.array(sorted(alphas), dtype=numpy.int64)
+        self.supportVectors = x[indices]
+        self.coefficients = numpy.array([alphas[j] for j in indices]) * y[indices]
+        self.bias = b
+        return not flagCont
+
+    def getScores(self, x):
+        """ Method that computes the scores of many inputs, by blocks
+        of PREDICTION_BLOCK_SIZE inputs so that the kernel matrix stays
+        small.
+
+        :param: x, (m,d) numpy array of inputs
+        :return: (m) numpy array of the scores
+        """
+        x = numpy.asarray(x, dtype=float)
+        scores = numpy.empty(x.shape[0])
+        for start in range(0, x.shape[0], PREDICTION_BLOCK_SIZE):
+            block = x[start:start + PREDICTION_BLOCK_SIZE]
+            kernels = getKernel(block, self.supportVectors, **self.kernelParameters)
+            scores[start:start + block.shape[0]] = kernels @ self.coefficients + self.bias
+        return scores
+
+    def prediction(self, x):
+        """ Method that predicts the outputs of many inputs.
+
+        :param: x, (m,d) numpy array of inputs
+        :return: (m) numpy array of the outputs, 1 or -1
+        """
+        return numpy.where(self.getScores(x) < 0, -1, 1)
+
+#-------------------------------------------------------------
+def main():
+
+    #parse command line
+    parser = argparse.ArgumentParser(description="program that learns \
+    a kernel perceptron, whose separator between one set of positive \
+    observations and one set of negative observations can be non-linear")
+    parser.add_argument("datafile",
+                        help="path to a data file containing 3 fields per line: x y {-1,1}")
+    parser.add_argument("-v", "--verbose", help="print the number of mistakes of each epoch",
+                        action="store_true")
+    parser.add_argument("-d", "--delimiter",
+                        help="delimiter used in the data file",
+                        default=" ")
+    parser.add_argument("-w", "--visualize", help="show the scatter plot of the data",
+                        action="store_true")
+    parser.add_argument("-r", "--learningRate", type=float, default=0.5,
+                        help="learning rate")
+    parser.add_argument("-e", "--maxEpochs", type=int, default=100,
+                        help="maximal number of epochs")
+    parser.add_argument("-k", "--kernel", help="kernel",
+                        choices=["rbf", "polynomial"], default="rbf")
+    parser.add_argument("-g", "--gamma", type=float, default=1.,
+                        help="scale of the kernel")
+    parser.add_argument("--degree", type=int, default=3,
+                        help="degree of the polynomial kernel")
+    parser.add_argument("--coef0", type=float, default=1.,
+                        help="constant term of the polynomial kernel")
+    parser.add_argument("-b", "--budget", type=int,
+                        help="maximal number of support vectors")
+    parser.add_argument("-c", "--cacheSize", type=int, default=1024,
+                        help="number of rows of the Gram matrix kept in memory")
+    parser.add_argument("-p", "--pocket", help="keep the support vectors \
+                        with the fewest training errors at the end of an epoch",
+                        action="store_true")
+    parser.add_argument("--compare", help="with a budget, also learn without \
+                        budget and compare the training errors",
+                        action="store_true")
+    args = parser.parse_args()
+
+    #get data, then solution
+    try:
+
+        x, y = getArrayFromDataFile(args.datafile, args.delimiter)
+        perceptron = KernelPerceptron(args.kernel, args.gamma, args.degree,
+                                      args.coef0, args.budget, args.cacheSize)
+        separated = perceptron.learning(x, y, args.learningRate, args.verbose,
+                                        args.maxEpochs, args.pocket)
+        nbErrors = numpy.count_nonzero(perceptron.prediction(x) != y)
+        print("#{} support vectors, {} training errors".format(
+            perceptron.supportVectors.shape[0], nbErrors))
+        print("#Kernel rows: {} computed, {} taken from the cache".format(
+            perceptron.cache.nbMisses, perceptron.cache.nbHits))
+        if not separated and args.maxEpochs > 0:
+            print("#Mistakes remain after {} epochs: the data may not be \
+separable with this kernel".format(args.maxEpochs))
+        if args.compare and args.budget is not None:
+            unbounded = KernelPerceptron(args.kernel, args.gamma, args.degree,
+                                         args.coef0, None, args.cacheSize)
+            unbounded.learning(x, y, args.learningRate, False, args.maxEpochs,
+                               args.pocket)
+            print("#Without budget: {} support vectors, {} training errors".format(
+                unbounded.supportVectors.shape[0],
+                numpy.count_nonzero(unbounded.prediction(x) != y)))
+
+    except ValueError:
+        print("Could not convert data; check the delimiter or the number and type of fields")
+        sys.exit(1)
+    except:
+        print("Unexpected error while reading from the file")
+        raise
+
+    #visualizing data
+    if args.visualize:
+
+        import matplotlib.pyplot as plt
+
+        #data points
+        plt.scatter(x[y == 1, 0], x[y == 1, 1], marker = '+')
+        plt.scatter(x[y == -1, 0], x[y == -1, 1], marker = '.')
+
+        #separating curve
+        x1, x2 = numpy.meshgrid(numpy.linspace(x[:,0].min(), x[:,0].max(), 200),
+                                numpy.linspace(x[:,1].min(), x[:,1].max(), 200))
+        grid = numpy.column_stack( (x1.ravel(), x2.ravel()) )
+        scores = perceptron.getScores(grid)
+        plt.contour(x1, x2, scores.reshape(x1.shape), levels=[0], colors="r")
+        plt.xlabel("x1")
+        plt.ylabel("x2")
+        plt.show()
+        plt.close()
+
+#-------------------------------------------------------------
+if __name__ == "__main__":
+    main()
@@ -1,68 +1,256 @@
 #!/usr/bin/env python3
 
 import sys
-import statistics
 import argparse
 import numpy
 
+# sizes of the blocks of samples whose margins are computed at once
+MIN_BLOCK_SIZE = 64
+MAX_BLOCK_SIZE = 1 << 16
+# numbers of inputs and of weights of the voted perceptron whose scores
+# are computed at once
+PREDICTION_BLOCK_SIZE = 256
+WEIGHTS_BLOCK_SIZE = 1 << 14
+# maximal number of weights kept by the voted perceptron
+MAX_VOTED_WEIGHTS = 1000
+# maximal number of samples on which the training errors of the voted
+# perceptron are counted
+ERROR_SAMPLE_SIZE = 10000
+
+#-------------------------------------------------------------
+def firstMistake(x, y, w, b, start):
+    """ Function that returns the index of the first sample, from
+    start, misclassified by the perceptron of weights w and bias b,
+    or the number of samples if there is none. The margins are
+    computed by one matrix-vector product per block of samples, the
+    blocks growing from the last mistake on.
+
+    :param: x, (n,d) numpy array of the inputs
+    :param: y, (n) numpy array of the outputs, 1 or -1
+    :param: w, (d) numpy array of the weights
+    :param: b, bias
+    :param: start, index of the first sample to test
+    """
+    n = x.shape[0]
+    blockSize = MIN_BLOCK_SIZE
+    while start < n:
+        end = min(start + blockSize, n)
+        margins = y[start:end] * (x[start:end] @ w + b)
+        mistakes = numpy.flatnonzero(margins < 0)
+        if mistakes.shape[0] > 0:
+            return start + mistakes[0]
+        start = end
+        blockSize = min(2 * blockSize, MAX_BLOCK_SIZE)
+    return n
+
+#-------------------------------------------------------------
+def learningEpoch(x, y, w, b, learningRate):
+    """ Function that processes every sample once, in order, and
+    updates the weights after each mistake, as the perceptron rule.
+
+    :param: w, (d) numpy array of the weights, updated in place
+    :return: the updated bias and the (m) numpy array of the indices
+    of the misclassified samples, in order
+    """
+    n = x.shape[0]
+    mistakes = []
+    i = firstMistake(x, y, w, b, 0)
+    while i < n:
+        w += learningRate*y[i]*x[i]
+        b += learningRate*y[i]
+        mistakes.append(i)
+        i = firstMistake(x, y, w, b, i+1)
+    return b, numpy.array(mistakes, dtype=numpy.int64)
+
+#-------------------------------------------------------------
+def countErrors(x, y, w, b):
+    """ Function that returns the number of samples misclassified by
+    the perceptron of weights w and bias b. """
+    return int(numpy.count_nonzero(y * (x @ w + b) < 0))
+
 #-------------------------------------------------------------
-def learning(learningSet, learningRate):
+def learning(x, y, learningRate, verbose=False, maxEpochs=None,
+             averaged=False, pocket=False):
     """ Function that learns the weights and bias of a perceptron
     from a given learning set.
 
-    :param: learningSet, list of tuples (x1,x2,y), where x1 and x2
-    are the components of the input vector and y is the output
+    The averaged perceptron returns the average of the weights after
+    each sample rather than the last ones. The average is computed
+    lazily: the sum of the updates weighted by their timestamp, the
+    number of samples processed so far, is enough to get it, so that
+    there is no work per sample, only per update.
+
+    With the pocket algorithm, the weights (last or averaged) with
+    the fewest training errors at the end of an epoch are returned,
+    which gives a useful separator on data that are not linearly
+    separable.
+
+    :param: x, (n,d) numpy array, the i-th row being the input
+    vector of the i-th sample
+    :param: y, (n) numpy array of the outputs, 1 or -1
     :param: learningRate, learning rate
-    :return: the weight (as a 2d numpy array) and the bias
+    :param: verbose, print the number of mistakes of each epoch
+    :param: maxEpochs, maximal number of epochs, None for no limit
+    :param: averaged, return the averaged weights
+    :param: pocket, return the best weights seen at the end of an epoch
+    :return: the weights (as a 1d numpy array), the bias and True if
+    the last epoch made no mistake (the data are linearly separable)
     """
-    #weigts = numpy vector of two components
-    w = numpy.array([[0.0],[0.0]])
+    x = numpy.ascontiguousarray(x, dtype=float)
+    y = numpy.asarray(y, dtype=float)
+    n = x.shape[0]
+    #weights = numpy vector of d components
+    w = numpy.zeros(x.shape[1])
     #bias = scalar
-    b = 1.0
+    b = b0 = 1.0
+    #sums of the updates weighted by their timestamp
+    sumW = numpy.zeros(x.shape[1])
+    sumB = 0.
+    candidate = (w, b)
+    best = (w.copy(), b, countErrors(x, y, w, b)) if pocket else None
     #learning loop
     c = 1
     flagCont = True
-    while flagCont:
-        print("#{}".format(c))
-        flagCont = False
-        for (x1, x2, y) in learningSet:
-            x = numpy.array([[x1],[x2]])
-            if y*(numpy.dot(w.T,x)+b) < 0:
-                w += learningRate*y*x
-                b += learningRate*y
-                flagCont = True
+    while flagCont and (maxEpochs is None or c <= maxEpochs):
+        b, mistakes = learningEpoch(x, y, w, b, learningRate)
+        if verbose:
+            print("#{} {} mistakes".format(c, mistakes.shape[0]))
+        flagCont = mistakes.shape[0] > 0
+
+        if averaged:
+            timestamps = (c-1)*n + mistakes + 1
+            steps = learningRate * timestamps * y[mistakes]
+            sumW += steps @ x[mistakes]
+            sumB += steps.sum()
+            # average of the weights after each of the T samples
+            T = c*n
+            candidate = ((T+1)*w - sumW) / T, b0 + ((T+1)*(b - b0) - sumB) / T
+        else:
+            candidate = (w, b)
+        if pocket:
+            nbErrors = countErrors(x, y, *candidate)
+            if nbErrors < best[2]:
+                best = (candidate[0].copy(), candidate[1], nbErrors)
         c += 1
-    return w, b
-        
+
+    if pocket:
+        return best[0], best[1], not flagCont
+    return candidate[0], candidate[1], not flagCont
+
+#-------------------------------------------------------------
+def mergeWeights(weights, biases, starts):
+    """ Function that halves the number of weights of a voted
+    perceptron by replacing the consecutive pairs of weights by their
+    average weighted by their votes, the merged weights getting the
+    sum of the votes. The last weights, whose vote is not known yet,
+    are kept as they are.
+
+    :param: weights, (K,d) numpy array of the weights
+    :param: biases, (K) numpy array of the biases
+    :param: starts, (K+1) numpy array of the timestamps from which
+    each weights are used, the last one being the current timestamp
+    :return: the merged weights, biases and starts
+    """
+    m = (weights.shape[0] - 1) // 2 * 2
+    votes = numpy.diff(starts[:m+1]).reshape(-1, 2)
+    total = numpy.maximum(votes.sum(axis=1), 1)
+    pairs = weights[:m].reshape(-1, 2, weights.shape[1])
+    merged = (votes[:,:,None] * pairs).sum(axis=1) / total[:,None]
+    mergedBiases = (votes * biases[:m].reshape(-1, 2)).sum(axis=1) / total
+    return numpy.concatenate( (merged, weights[m:]) ), \
+        numpy.concatenate( (mergedBiases, biases[m:]) ), \
+        numpy.concatenate( (starts[:m:2], starts[m:]) )
+
+#-------------------------------------------------------------
+def votedLearning(x, y, learningRate, verbose=False, maxEpochs=None,
+                  maxWeights=MAX_VOTED_WEIGHTS):
+    """ Function that learns a voted perceptron: every weights taken
+    by the perceptron are kept, with the number of samples processed
+    before the next mistake as vote. The weights of an epoch are
+    recovered at its end by a cumulative sum of its updates. On data
+    that are not linearly separable, there is one weights per
+    mistake: past maxWeights weights, consecutive weights are merged
+    (see mergeWeights), so that the memory and the cost of the
+    prediction are bounded.
+
+    :param: x, (n,d) numpy array of the inputs
+    :param: y, (n) numpy array of the outputs, 1 or -1
+    :param: maxWeights, maximal number of weights kept at the end of
+    an epoch
+    :return: the (K,d) numpy array of the weights, the (K) numpy
+    arrays of the biases and of the votes, and True if the last
+    epoch made no mistake
+    """
+    x = numpy.ascontiguousarray(x, dtype=float)
+    y = numpy.asarray(y, dtype=float)
+    n = x.shape[0]
+    w = numpy.zeros(x.shape[1])
+    b = 1.0
+    weights, biases, starts = w.copy()[None], numpy.array([b]), numpy.zeros(1)
+    c = 1
+    flagCont = True
+    while flagCont and (maxEpochs is None or c <= maxEpochs):
+        wStart, bStart = w.copy(), b
+        b, mistakes = learningEpoch(x, y, w, b, learningRate)
+        if verbose:
+            print("#{} {} mistakes".format(c, mistakes.shape[0]))
+        flagCont = mistakes.shape[0] > 0
+
+        steps = learningRate * y[mistakes]
+        weights = numpy.concatenate( (weights, wStart + numpy.cumsum(
+            steps[:,None] * x[mistakes], axis=0)) )
+        biases = numpy.concatenate( (biases, bStart + numpy.cumsum(steps)) )
+        # weights taken after sample i are used from sample i+1 on
+        starts = numpy.concatenate( (starts, (c-1)*n + mistakes + 1.) )
+        while weights.shape[0] > maxWeights:
+            weights, biases, starts = mergeWeights(weights, biases,
+                                                   numpy.append(starts, c*n))
+            starts = starts[:-1]
+        c += 1
+
+    votes = numpy.diff(numpy.append(starts, (c-1)*n))
+    return weights, biases, votes, not flagCont
+
+#-------------------------------------------------------------
+def votedPrediction(x, weights, biases, votes):
+    """ Function that predicts the outputs of a voted perceptron. The
+    signs of the scores are computed by blocks of PREDICTION_BLOCK_SIZE
+    inputs and WEIGHTS_BLOCK_SIZE weights, so that the memory does not
+    depend on the number of weights.
+
+    :param: x, (m,d) numpy array of inputs
+    :return: (m) numpy array of the outputs, 1 or -1
+    """
+    x = numpy.asarray(x, dtype=float)
+    votesSum = numpy.zeros(x.shape[0])
+    for start in range(0, x.shape[0], PREDICTION_BLOCK_SIZE):
+        block = x[start:start + PREDICTION_BLOCK_SIZE]
+        for k in range(0, weights.shape[0], WEIGHTS_BLOCK_SIZE):
+            end = k + WEIGHTS_BLOCK_SIZE
+            signs = numpy.sign(block @ weights[k:end].T + biases[k:end])
+            votesSum[start:start + block.shape[0]] += signs @ votes[k:end]
+    return numpy.where(votesSum < 0, -1, 1)
+
 #-------------------------------------------------------------
 def getArrayFromDataFile(path, delimiter):
     """ Function that reads a file composed of lines containing
-    at least three fields and returns a list containing the values
-    of the three first fields.
+    the d components of an input vector followed by an output,
+    1 or -1.
  
     :param: path, path to the file to read
     :param: delimiter, character used to delimit the fields
-    :return: a list of tuple (x1,x2,y) where x1 and x2 are floats
-    and y is an integer either equal to 1 or -1. 
+    :return: a (n,d) numpy array of floats, the inputs, and a (n)
+    numpy array of integers equal to 1 or -1, the outputs
     """
+    data = numpy.loadtxt(path, delimiter=delimiter, ndmin=2)
+    if data.shape[1] < 2:
+        raise ValueError
+    x = numpy.ascontiguousarray(data[:,:-1])
+    y = data[:,-1].astype(int)
+    if not numpy.isin(data[:,-1], [1, -1]).all():
+        raise ValueError
 
-    dataFile = open(path,'r')
-
-    dataSetAsList = []
-    for line in dataFile.readlines():
-        fields = line.split(delimiter)
-        if len(fields) != 3:
-            raise ValueError
-        x1 = float(fields[0])
-        x2 = float(fields[1])
-        y = int(fields[2])
-        if y != 1 and y != -1:
-            raise ValueError
-        dataSetAsList.append( (x1,x2,y) )
-
-    dataFile.close()
-
-    return dataSetAsList
+    return x, y
 
 #-------------------------------------------------------------
 def main():
@@ -74,6 +262,8 @@ def main():
     separable)")
     parser.add_argument("datafile",
                         help="path to a data file containing 3 fields per line: x y {-1,1}")
+    parser.add_argument("-v", "--verbose", help="print the number of mistakes of each epoch",
+                        action="store_true")
     parser.add_argument("-d", "--delimiter",
                         help="delimiter used in the data file",
                         default=" ")
@@ -81,14 +271,43 @@ def main():
                         action="store_true")
     parser.add_argument("-r", "--learningRate", type=float, default=0.5,  
                         help="learning rate")
+    parser.add_argument("-e", "--maxEpochs", type=int, default=1000,
+                        help="maximal number of epochs")
+    parser.add_argument("-a", "--variant", help="variant of the perceptron",
+                        choices=["standard", "averaged", "voted"],
+                        default="standard")
+    parser.add_argument("-p", "--pocket", help="keep the weights with the fewest \
+                        training errors (standard and averaged variants)",
+                        action="store_true")
+    parser.add_argument("-k", "--maxWeights", type=int, default=MAX_VOTED_WEIGHTS,
+                        help="maximal number of weights of the voted perceptron")
     args = parser.parse_args()
 
     #get data, then solution
     try:
         
-        learningSet = getArrayFromDataFile(args.datafile, args.delimiter)
-        weights, bias = learning(learningSet, args.learningRate)
-        print("#Perceptron weights = {} and bias = {}".format(weights, bias))
+        x, y = getArrayFromDataFile(args.datafile, args.delimiter)
+        if args.variant == "voted":
+            votedWeights, votedBiases, votes, separated = votedLearning(
+                x, y, args.learningRate, args.verbose, args.maxEpochs,
+                args.maxWeights)
+            print("#Voted perceptron of {} weights".format(votes.shape[0]))
+            #errors counted on a sample of the training set
+            sample = numpy.random.default_rng(0).permutation(x.shape[0])[:ERROR_SAMPLE_SIZE]
+            nbErrors = numpy.count_nonzero(votedPrediction(x[sample], votedWeights,
+                                                           votedBiases, votes) != y[sample])
+            print("#{} training errors out of {} samples".format(nbErrors,
+                                                                sample.shape[0]))
+        else:
+            weights, bias, separated = learning(x, y, args.learningRate, args.verbose,
+                                                args.maxEpochs, args.variant == "averaged",
+                                                args.pocket)
+            nbErrors = countErrors(x, y, weights, bias)
+            print("#Perceptron weights = {} and bias = {}".format(weights, bias))
+            print("#{} training errors".format(nbErrors))
+        if not separated and args.maxEpochs > 0:
+            print("#Mistakes remain after {} epochs: the data may not be linearly \
+separable".format(args.maxEpochs))
         
     except ValueError:
         print("Could not convert data; check the delimiter or the number and type of fields")
@@ -103,16 +322,25 @@ def main():
         import matplotlib.pyplot as plt
 
         #data points
-        plt.scatter([x for (x,_,l) in learningSet if l == 1],
-                    [y for (_,y,l) in learningSet if l == 1], marker = '+') 
-        plt.scatter([x for (x,_,l) in learningSet if l == -1],
-                    [y for (_,y,l) in learningSet if l == -1], marker = '.') 
+        plt.scatter(x[y == 1, 0], x[y == 1, 1], marker = '+') 
+        plt.scatter(x[y == -1, 0], x[y == -1, 1], marker = '.') 
+
+        if args.variant == "voted":
+            #regions of each predicted output
+            x1, x2 = numpy.meshgrid(numpy.linspace(x[:,0].min(), x[:,0].max(), 200),
+                                    numpy.linspace(x[:,1].min(), x[:,1].max(), 200))
+            grid = numpy.column_stack( (x1.ravel(), x2.ravel()) )
+            prediction = votedPrediction(grid, votedWeights, votedBiases, votes)
+            plt.contour(x1, x2, prediction.reshape(x1.shape), levels=[0], colors="r")
+            plt.show()
+            plt.close()
+            return
 
         #separating line
         a = - weights[0] / weights[1]
         b = - bias / weights[1]
-        xmin = min([x for (x,_,_) in learningSet])
-        xmax = max([x for (x,_,_) in learningSet])
+        xmin = x[:,0].min()
+        xmax = x[:,0].max()
         x1 = numpy.linspace(xmin,xmax,100)
         x2 = a*x1+b
         plt.plot(x1, x2, "-r", label="x2={}x1+{}".format(a,b))
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+import argparse
+import contextlib
+import io
+import time
+import numpy
+import classifier
+
+#-------------------------------------------------------------
+def getSeparableDataSets(n, rng, margin=0.5):
+    """ Function that draws n points uniformly in [-5,5]^2, apart from
+    a band of half-width margin around the line x2 = 0.5 x1 + 1, the
+    points above the line being positive.
+
+    :return: (n1,2) and (n2,2) numpy arrays of the positive and
+    negative points
+    """
+    x1 = rng.uniform(-5, 5, n)
+    label = numpy.where(rng.random(n) < 0.5, -1., 1.)
+    x2 = 0.5*x1 + 1 + label * rng.uniform(margin, 5, n)
+    points = numpy.column_stack( (x1, x2) )
+    return points[label == 1], points[label == -1]
+
+#-------------------------------------------------------------
+def timeIt(f):
+    """ Function that calls f, silencing its output, and returns
+    its result (None if it failed) and its wall time. """
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = f()
+    except classifier.SolverError:
+        result = None
+    return result, time.perf_counter() - start
+
+#-------------------------------------------------------------
+def main():
+
+    #parse command line
+    parser = argparse.ArgumentParser(description="program that measures \
+    the time of the assembly of the sparse constraint matrix and of the \
+    resolution of the L1 and Linf separation problems by the dual \
+    simplex and interior point methods of HiGHS")
+    parser.add_argument("-e", "--maxExponent",
+                        help="largest number of points, as a power of ten",
+                        type=int, default=6)
+    parser.add_argument("-s", "--seed", help="seed of the generated points",
+                        type=int, default=0)
+    args = parser.parse_args()
+
+    rng = numpy.random.default_rng(args.seed)
+    methods = ["highs-ds", "highs-ipm"]
+
+    print("# n norm assembly(s) " + " ".join(m + "(s) margin" for m in methods))
+    for e in range(3, args.maxExponent+1):
+        n = 10**e
+        s1, s2 = getSeparableDataSets(n, rng)
+        for norm, signs, lastRow, solve in [
+                ("L1", (1,-1), {0: 1, 1: 1, 2: 1, 3: 1},
+                 classifier.getSolFromTwoDataSetsL1),
+                ("Linf", (1,), None, classifier.getSolFromTwoDataSetsLinf)]:
+            _, assemblyTime = timeIt(
+                lambda: classifier.getSeparationConstraints(s1, s2, signs, lastRow))
+            line = f"{n} {norm} {assemblyTime:.4f}"
+            for method in methods:
+                sol, solveTime = timeIt(lambda: solve(s1, s2, method))
+                if sol is None:
+                    line += f" {solveTime:.4f} failed"
+                else:
+                    margin = (sol[2] - sol[3]) / numpy.linalg.norm(sol[:2])
+                    line += f" {solveTime:.4f} {margin:.6f}"
+            print(line, flush=True)
+
+#-------------------------------------------------------------
+if __name__ == "__main__":
+    main()
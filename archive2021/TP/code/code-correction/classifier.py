@@ -5,42 +5,87 @@ import statistics
 import argparse
 import numpy
 import scipy.optimize
+import scipy.sparse
 
 #-------------------------------------------------------------
 class SolverError(Exception):
     pass
 
 #-------------------------------------------------------------
-def getSolution(c, A_ub, b_ub, A_eq, b_eq, bds):
+def getSolution(c, A_ub, b_ub, A_eq, b_eq, bds, method="highs"):
     
     res = scipy.optimize.linprog(c, A_ub=A_ub, b_ub=b_ub,
                                  A_eq=A_eq, b_eq=b_eq,
                                  bounds=bds,
-                                 method='revised simplex')
+                                 method=method)
     print(res)
 
     return res
 
 #-------------------------------------------------------------
-def getAndCheckSolution(c, A_ub, b_ub, A_eq, b_eq, bds):
+def getAndCheckSolution(c, A_ub, b_ub, A_eq, b_eq, bds, method="highs"):
 
-    res = getSolution(c, A_ub, b_ub, A_eq, b_eq, bds)
+    res = getSolution(c, A_ub, b_ub, A_eq, b_eq, bds, method)
     if res.success:
         return res.x
     else:
         raise SolverError        
 
 #-------------------------------------------------------------
-def getSolFromTwoDataSets(s1, s2, norm):
+def getSolFromTwoDataSets(s1, s2, norm, method="highs"):
     if norm == "L1":
-        return getSolFromTwoDataSetsL1(s1, s2)
+        return getSolFromTwoDataSetsL1(s1, s2, method)
     elif norm == "Linf":
-        return getSolFromTwoDataSetsLinf(s1,s2)
+        return getSolFromTwoDataSetsLinf(s1, s2, method)
     else:
         raise ValueError()
     
 #-------------------------------------------------------------
-def getSolFromTwoDataSetsL1(s1, s2):
+def getSeparationConstraints(s1, s2, signs, lastRow=None):
+    """ Function that assembles, in CSR format, the constraints
+    w.x >= zp for x in s1 and w.x <= zm for x in s2, written as
+    -w.x + zp <= 0 and w.x - zm <= 0, where w is a combination of
+    copies of the variables x1, x2 given by signs. Every row has the
+    same number of nonzero entries, so that the arrays of the CSR
+    format are allocated once and filled in place, without dense
+    intermediate blocks.
+
+    :param: s1, s2, (n1,2) and (n2,2) numpy arrays of the points
+    :param: signs, signs of the copies of (x1, x2) in w, (1,) for the
+    variables x1 x2 zp zm, (1,-1) for x1+ x2+ x1- x2- zp zm
+    :param: lastRow, dict {column: value} of an additional last row
+    :return: csr matrix of n1+n2 rows, n1+n2+1 with lastRow
+    """
+    nbRowsS1, nbRowsS2 = s1.shape[0], s2.shape[0]
+    n = nbRowsS1 + nbRowsS2
+    nbVars = 2*len(signs)
+    nnzPerRow = nbVars + 1
+    lastRow = {} if lastRow is None else lastRow
+    nnz = n*nnzPerRow + len(lastRow)
+
+    data = numpy.empty(nnz)
+    indices = numpy.empty(nnz, dtype=numpy.int32)
+    blockData = data[:n*nnzPerRow].reshape(n, nnzPerRow)
+    blockIndices = indices[:n*nnzPerRow].reshape(n, nnzPerRow)
+    for k, sign in enumerate(signs):
+        blockData[:nbRowsS1, 2*k:2*k+2] = -sign * s1
+        blockData[nbRowsS1:, 2*k:2*k+2] = sign * s2
+    blockData[:nbRowsS1, -1] = 1
+    blockData[nbRowsS1:, -1] = -1
+    blockIndices[:, :-1] = numpy.arange(nbVars)
+    blockIndices[:nbRowsS1, -1] = nbVars     # zp
+    blockIndices[nbRowsS1:, -1] = nbVars + 1 # zm
+    data[n*nnzPerRow:] = list(lastRow.values())
+    indices[n*nnzPerRow:] = list(lastRow.keys())
+
+    nbRows = n + 1 if lastRow else n
+    indptr = numpy.arange(nbRows + 1, dtype=numpy.int64) * nnzPerRow
+    indptr[-1] = nnz
+    return scipy.sparse.csr_matrix( (data, indices, indptr),
+                                    shape=(nbRows, nbVars + 2) )
+
+#-------------------------------------------------------------
+def getSolFromTwoDataSetsL1(s1, s2, method="highs"):
 
     nbRowsS1, _ = s1.shape
     nbRowsS2, _ = s2.shape
@@ -50,26 +95,19 @@ def getSolFromTwoDataSetsL1(s1, s2):
     b = numpy.zeros(nbRowsS1 + nbRowsS2 + 1)
     b[-1] = 1
 
-    #2d array
-    zp_top = numpy.full( (nbRowsS1,1), 1 )
-    zm_top = numpy.zeros( (nbRowsS1,1) )
-    A_top = numpy.concatenate( (-s1, s1, zp_top, zm_top), axis=1 )
-    zp_bot = numpy.zeros( (nbRowsS2,1) )
-    zm_bot = numpy.full( (nbRowsS2,1), -1 )
-    A_bot = numpy.concatenate( (s2, -s2, zp_bot, zm_bot), axis=1 )
-    L1constraint = numpy.array([[1,1,1,1,0,0]])
-    A = numpy.concatenate( (A_top, A_bot, L1constraint), axis=0 )
+    #sparse 2d array, the last row being the L1 constraint
+    A = getSeparationConstraints(s1, s2, (1,-1), {0: 1, 1: 1, 2: 1, 3: 1})
     
     #bounds
     rpos = (0,numpy.inf)
     r = (-numpy.inf,numpy.inf)
     bounds = [rpos, rpos, rpos, rpos, r, r]
 
-    sol = getAndCheckSolution(c,A,b,None,None,bounds)
+    sol = getAndCheckSolution(c,A,b,None,None,bounds,method)
     return numpy.array([sol[0] - sol[2], sol[1] - sol[3], sol[4], sol[5]])
     
 #-------------------------------------------------------------
-def getSolFromTwoDataSetsLinf(s1, s2):
+def getSolFromTwoDataSetsLinf(s1, s2, method="highs"):
     
     nbRowsS1, _ = s1.shape
     nbRowsS2, _ = s2.shape
@@ -78,21 +116,15 @@ def getSolFromTwoDataSetsLinf(s1, s2):
     c = numpy.array([0,0,-1,1])
     b = numpy.zeros(nbRowsS1 + nbRowsS2)
     
-    #2d array
-    zp_top = numpy.full( (nbRowsS1,1), 1 )
-    zm_top = numpy.zeros( (nbRowsS1,1) )
-    A_top = numpy.concatenate( (-s1, zp_top, zm_top), axis=1 )
-    zp_bot = numpy.zeros( (nbRowsS2,1) )
-    zm_bot = numpy.full( (nbRowsS2,1), -1 )
-    A_bot = numpy.concatenate( (s2, zp_bot, zm_bot), axis=1 )
-    A = numpy.concatenate( (A_top, A_bot), axis=0 )
+    #sparse 2d array
+    A = getSeparationConstraints(s1, s2, (1,))
     
     #bounds
     r1 = (-1,1)
     r = (-numpy.inf,numpy.inf)
     bounds = [r1, r1, r, r]
 
-    sol = getAndCheckSolution(c,A,b,None,None,bounds)
+    sol = getAndCheckSolution(c,A,b,None,None,bounds,method)
     return numpy.array([sol[0], sol[1], sol[2], sol[3]])
 
 #-------------------------------------------------------------
@@ -136,6 +168,9 @@ def main():
                         default=" ")
     parser.add_argument("-n", "--norm",help="norm used to normalize the optimization problem",
                     choices=["L1","Linf"],default="L1")
+    parser.add_argument("-m", "--method", help="algorithm of the LP solver HiGHS: \
+                        dual simplex, interior point method or automatic choice",
+                        choices=["highs-ds","highs-ipm","highs"], default="highs")
     parser.add_argument("-w", "--visualize", help="show the scatter plot of the data",
                         action="store_true")
     args = parser.parse_args()
@@ -143,7 +178,7 @@ def main():
     #get data, then solution
     try:
         s1, s2 = getArrayFromDataFile(args.datafile, args.delimiter)
-        x1, x2, zp, zm = getSolFromTwoDataSets(s1,s2,args.norm)
+        x1, x2, zp, zm = getSolFromTwoDataSets(s1,s2,args.norm,args.method)
         x = numpy.array([x1, x2])
         print("#final solution={}".format(x))
         l1 = numpy.linalg.norm(x, 1)
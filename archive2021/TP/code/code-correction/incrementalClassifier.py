@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+
+import sys
+import argparse
+import contextlib
+import io
+import time
+import numpy
+import classifier
+
+# relative tolerance telling whether a point lies on its margin line
+ACTIVE_TOLERANCE = 1e-9
+# maximal number of violating points of each class added to the
+# working set before solving again
+MAX_ADDED_POINTS = 1000
+
+#-------------------------------------------------------------
+class GrowingArray(object):
+    """ (n,2) numpy array to which rows are appended, the capacity
+    being doubled when it is full. """
+
+    def __init__(self, capacity=1024):
+        self.data = numpy.empty( (capacity, 2) )
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, rows):
+        rows = numpy.asarray(rows, dtype=float).reshape(-1, 2)
+        capacity = self.data.shape[0]
+        while capacity < self.size + rows.shape[0]:
+            capacity *= 2
+        if capacity > self.data.shape[0]:
+            data = numpy.empty( (capacity, 2) )
+            data[:self.size] = self.data[:self.size]
+            self.data = data
+        self.data[self.size:self.size + rows.shape[0]] = rows
+        self.size += rows.shape[0]
+
+    def get(self):
+        return self.data[:self.size]
+
+#-------------------------------------------------------------
+class ClassifierSession(object):
+    """ Maximum margin separator of two sets of points to which points
+    are appended. The optimal solution (x1, x2, zp, zm) is kept with
+    its active set, the points lying on the lines x1 p1 + x2 p2 = zp
+    and x1 p1 + x2 p2 = zm:
+    - appending points on the right side of these lines is O(number of
+      new points), since the solution stays optimal with the new
+      constraints,
+    - otherwise the LP is solved on the active set and the violating
+      points only, the points of the whole sets that violate the new
+      solution being added until there is none (constraint
+      generation). """
+
+    def __init__(self, norm="L1", method="highs"):
+        if norm not in ("L1", "Linf"):
+            raise ValueError()
+        self.norm = norm
+        self.method = method
+        self.s1 = GrowingArray()
+        self.s2 = GrowingArray()
+        self.sol = None # numpy array [x1, x2, zp, zm]
+        self.active1 = numpy.empty(0, dtype=numpy.int64) # rows of s1
+        self.active2 = numpy.empty(0, dtype=numpy.int64) # rows of s2
+        self.resetStatistics()
+
+    def addPoints(self, s1, s2):
+        """ Method that appends positive and negative points and updates
+        the separator if some of them violate its margin.
+
+        :param: s1, (m1,2) numpy array of the new positive points
+        :param: s2, (m2,2) numpy array of the new negative points
+        """
+        start1, start2 = len(self.s1), len(self.s2)
+        self.s1.append(s1)
+        self.s2.append(s2)
+        self.nbAddedPoints += len(self.s1) - start1 + len(self.s2) - start2
+        if len(self.s1) == 0 or len(self.s2) == 0:
+            return
+
+        if self.sol is None:
+            added1 = numpy.arange(len(self.s1))
+            added2 = numpy.arange(len(self.s2))
+        else:
+            added1 = start1 + self.getViolations(self.s1.get()[start1:], 1)
+            added2 = start2 + self.getViolations(self.s2.get()[start2:], -1)
+            if added1.shape[0] == 0 and added2.shape[0] == 0:
+                return
+        self.resolve(added1, added2)
+
+    def getViolations(self, points, label):
+        """ Method that returns the indices of the points on the wrong
+        side of the margin line of their class, the most violating
+        first.
+
+        :param: points, (m,2) numpy array
+        :param: label, 1 for the positive points, -1 for the negative
+        ones
+        :return: numpy array of indices in points
+        """
+        x1, x2, zp, zm = self.sol
+        products = points @ numpy.array([x1, x2])
+        if label == 1:
+            slacks = products - zp
+        else:
+            slacks = zm - products
+        violations = numpy.flatnonzero(slacks < -self.getTolerance())
+        return violations[numpy.argsort(slacks[violations])]
+
+    def getTolerance(self):
+        x1, x2, zp, zm = self.sol
+        return ACTIVE_TOLERANCE * max(1., abs(zp), abs(zm))
+
+    def resolve(self, added1, added2):
+        """ Method that solves the LP on the active set and the given
+        points, then adds the violating points until the solution is
+        optimal for the whole sets.
+
+        :param: added1, added2, indices of points of s1 and s2 to add to
+        the working set
+        """
+        start = time.perf_counter()
+        s1, s2 = self.s1.get(), self.s2.get()
+        working1 = numpy.union1d(self.active1, added1)
+        working2 = numpy.union1d(self.active2, added2)
+        while True:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.sol = classifier.getSolFromTwoDataSets(
+                    s1[working1], s2[working2], self.norm, self.method)
+            self.nbLPs += 1
+            violations1 = self.getViolations(s1, 1)[:MAX_ADDED_POINTS]
+            violations2 = self.getViolations(s2, -1)[:MAX_ADDED_POINTS]
+            if violations1.shape[0] == 0 and violations2.shape[0] == 0:
+                break
+            working1 = numpy.union1d(working1, violations1)
+            working2 = numpy.union1d(working2, violations2)
+
+        # the points on the margin lines define the solution
+        x1, x2, zp, zm = self.sol
+        tolerance = self.getTolerance()
+        self.active1 = working1[s1[working1] @ numpy.array([x1, x2]) - zp <= tolerance]
+        self.active2 = working2[zm - s2[working2] @ numpy.array([x1, x2]) <= tolerance]
+        self.nbResolutions += 1
+        self.resolutionTime += time.perf_counter() - start
+
+    def getSolution(self):
+        """
+        :return: numpy array [x1, x2, zp, zm], or None if one of the
+        sets is empty
+        """
+        return self.sol
+
+    def getMargin(self):
+        x1, x2, zp, zm = self.sol
+        return (zp - zm) / numpy.hypot(x1, x2)
+
+    def resetStatistics(self):
+        """ Method that starts a new measure of the updates. """
+        self.nbAddedPoints = 0
+        self.nbResolutions = 0
+        self.nbLPs = 0
+        self.resolutionTime = 0.
+        self.startTime = time.perf_counter()
+
+    def getStatistics(self):
+        """ Method that returns statistics about the updates since the
+        creation of the session or the last call to resetStatistics.
+
+        :return: dict with the numbers of added points, resolutions and
+        LPs solved, the number of points added per second and the share
+        of the time spent in resolutions
+        """
+        elapsed = time.perf_counter() - self.startTime
+        return {"points": self.nbAddedPoints,
+                "resolutions": self.nbResolutions,
+                "lps": self.nbLPs,
+                "pointsPerSecond": self.nbAddedPoints / elapsed,
+                "resolutionShare": self.resolutionTime / elapsed}
+
+#-------------------------------------------------------------
+def main():
+
+    #parse command line
+    parser = argparse.ArgumentParser(description="program that computes \
+    the maximum margin separator of the first points of a data file, then \
+    appends the other points by batches and updates the separator only \
+    when they violate its margin")
+    parser.add_argument("datafile",
+                        help="path to a data file containing 3 fields per line: x, y {-1,1}")
+    parser.add_argument("-d", "--delimiter",
+                        help="delimiter used in the data file",
+                        default=" ")
+    parser.add_argument("-n", "--norm",help="norm used to normalize the optimization problem",
+                    choices=["L1","Linf"],default="L1")
+    parser.add_argument("-m", "--method", help="algorithm of the LP solver HiGHS",
+                        choices=["highs-ds","highs-ipm","highs"], default="highs")
+    parser.add_argument("-i", "--initialRatio", type=float, default=0.5,
+                        help="ratio of the points of the initial separator")
+    parser.add_argument("-b", "--batchSize", type=int, default=10,
+                        help="number of points appended at once")
+    args = parser.parse_args()
+
+    #get data, then solutions
+    try:
+        s1, s2 = classifier.getArrayFromDataFile(args.datafile, args.delimiter)
+        session = ClassifierSession(args.norm, args.method)
+        n1 = int(args.initialRatio * s1.shape[0])
+        n2 = int(args.initialRatio * s2.shape[0])
+        session.addPoints(s1[:n1], s2[:n2])
+        session.resetStatistics()
+
+        # the points of both classes are appended in the order of the file
+        nbBatches = max(1, -(-(s1.shape[0] - n1 + s2.shape[0] - n2) // args.batchSize))
+        bounds1 = numpy.linspace(n1, s1.shape[0], nbBatches + 1).astype(int)
+        bounds2 = numpy.linspace(n2, s2.shape[0], nbBatches + 1).astype(int)
+        for k in range(nbBatches):
+            session.addPoints(s1[bounds1[k]:bounds1[k+1]], s2[bounds2[k]:bounds2[k+1]])
+
+        statistics = session.getStatistics()
+        print("#{points} points appended, {resolutions} resolutions, {lps} LPs: "
+              "{pointsPerSecond:.0f} points/s, {resolutionShare:.1%} of the time "
+              "solving".format(**statistics))
+        print("#final solution={}".format(session.getSolution()))
+        scratchSession = ClassifierSession(args.norm, args.method)
+        scratchSession.addPoints(s1, s2)
+        print("#margin: {}, from scratch: {}".format(session.getMargin(),
+                                                     scratchSession.getMargin()))
+
+    except ValueError:
+        print("Could not convert data")
+        sys.exit(1)
+    except classifier.SolverError:
+        print("Could not solve the problem")
+        sys.exit(1)
+
+#-------------------------------------------------------------
+if __name__ == "__main__":
+    main()
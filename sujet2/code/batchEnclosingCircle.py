@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+import argparse
+import time
+import multiprocessing
+import numpy
+from enclosingCircle import getCircleByWelzl
+from generateData import getPointsInDisc
+
+#-------------------------------------------------------------
+# point sets shared by the worker processes
+sharedData = None
+
+def initWorker(offsets, coordinates):
+    global sharedData
+    sharedData = (offsets, coordinates)
+
+#-------------------------------------------------------------
+def solveRange(bounds):
+    """ Function that computes the smallest enclosing circles of the
+    point sets of indices in [start, end) of the shared data.
+
+    :param: bounds, pair (start, end)
+    :return: (end-start,3) numpy array of the triples (cx, cy, r),
+    nan for the sets that could not be solved
+    """
+    offsets, coordinates = sharedData
+    start, end = bounds
+    circles = numpy.full( (end - start, 3), numpy.nan )
+    for i in range(start, end):
+        points = coordinates[offsets[i]:offsets[i+1]]
+        if points.shape[0] > 0 and numpy.isfinite(points).all():
+            circles[i - start] = getCircleByWelzl(points)
+    return circles
+
+#-------------------------------------------------------------
+def getCirclesOfBatch(offsets, coordinates, nbProcesses=1):
+    """ Function that computes the smallest enclosing circles of many
+    independent point sets in one call, stored as a ragged array: the
+    points of the i-th set are coordinates[offsets[i]:offsets[i+1]].
+    The sets are split into contiguous ranges solved by a pool of
+    processes. Empty sets or sets with non finite coordinates are
+    flagged instead of raising an exception.
+
+    :param: offsets, (m+1) nondecreasing integer array, offsets[0]=0
+    :param: coordinates, (N,2) numpy array, N=offsets[m]
+    :param: nbProcesses, number of processes, 1 to solve in the
+    calling process
+    :return: (m,2) numpy array of the centers, (m) numpy array of the
+    radii and (m) boolean numpy array, True for the sets that failed
+    """
+    offsets = numpy.asarray(offsets, dtype=numpy.int64)
+    coordinates = numpy.asarray(coordinates, dtype=float).reshape(-1, 2)
+    if offsets.ndim != 1 or offsets.shape[0] == 0 or offsets[0] != 0 \
+       or offsets[-1] != coordinates.shape[0] or (numpy.diff(offsets) < 0).any():
+        raise ValueError()
+    m = offsets.shape[0] - 1
+
+    if nbProcesses <= 1:
+        initWorker(offsets, coordinates)
+        circles = solveRange( (0, m) )
+    else:
+        # several ranges per process to balance the load
+        bounds = numpy.linspace(0, m, 4*nbProcesses + 1).astype(int)
+        with multiprocessing.Pool(nbProcesses, initWorker,
+                                  (offsets, coordinates)) as pool:
+            circles = numpy.concatenate(pool.map(solveRange,
+                                                 zip(bounds[:-1], bounds[1:])))
+
+    failed = numpy.isnan(circles[:,2])
+    return circles[:,:2], circles[:,2], failed
+
+#-------------------------------------------------------------
+def main():
+
+    #parse command line
+    parser = argparse.ArgumentParser(description="program that computes \
+    the smallest enclosing circles of many clusters of 2d points in one \
+    call and reports the number of clusters solved per second")
+    parser.add_argument("-m", "--nbSets", help="number of clusters",
+                        type=int, default=10000)
+    parser.add_argument("-n", "--number",
+                        help="maximal number of points per cluster",
+                        type=int, default=50)
+    parser.add_argument("-j", "--nbProcesses", help="number of processes",
+                        type=int, default=1)
+    parser.add_argument("-s", "--seed", help="seed of the generated points",
+                        type=int, default=0)
+    args = parser.parse_args()
+
+    r = 100 #radius of the disc in which lie the generated points
+    rng = numpy.random.default_rng(args.seed)
+    sizes = rng.integers(0, args.number, args.nbSets, endpoint=True)
+    offsets = numpy.concatenate( ([0], numpy.cumsum(sizes)) )
+    coordinates = getPointsInDisc(offsets[-1], r, rng)
+
+    start = time.perf_counter()
+    centers, radii, failed = getCirclesOfBatch(offsets, coordinates,
+                                               args.nbProcesses)
+    wallTime = time.perf_counter() - start
+
+    print("#{} clusters of {} points in {:.2f}s ({:.0f} clusters/s), "
+          "{} failed (empty), mean radius {:.3f}".format(
+              args.nbSets, offsets[-1], wallTime, args.nbSets / wallTime,
+              failed.sum(), radii[~failed].mean()))
+
+#-------------------------------------------------------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+import argparse
+import contextlib
+import io
+import math
+import time
+import numpy
+import smallestEnclosingCircle
+import smallestEnclosingCircleDual
+from enclosingCircle import getCircleByWelzl
+from generateData import getPointsInDisc
+
+#-------------------------------------------------------------
+def timeIt(f):
+    """ Function that calls f, silencing its output, and returns
+    its result (None if it failed) and its wall time. """
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = f()
+    except (ValueError, smallestEnclosingCircle.SolverError):
+        result = None
+    return result, time.perf_counter() - start
+
+#-------------------------------------------------------------
+def solveByLP(pointSet):
+    sol = smallestEnclosingCircle.getSolFromSubProblem(pointSet,
+                                                       numpy.array([0,0,-1]))
+    return smallestEnclosingCircle.toCircle(sol)[2]
+
+#-------------------------------------------------------------
+def solveByFrankWolfe(pointSet):
+    sol = smallestEnclosingCircleDual.getInitialSolution(pointSet)
+    sol = smallestEnclosingCircleDual.getSolByFrankWolfe(pointSet, sol)
+    _, _, r2 = smallestEnclosingCircleDual.getParameters(pointSet, sol)
+    return math.sqrt(r2)
+
+#-------------------------------------------------------------
+def solveByCoreSet(points, epsilon):
+    sol, epsilon, _ = smallestEnclosingCircleDual.getSolByCoreSet(points, epsilon)
+    _, _, r2 = smallestEnclosingCircleDual.getParameters(points, sol)
+    #radius of the circle enclosing all the points
+    return (1 + epsilon) * math.sqrt(r2)
+
+#-------------------------------------------------------------
+def main():
+
+    #parse command line
+    parser = argparse.ArgumentParser(description="program that compares \
+    the running time of Welzl's algorithm, in floating point and robust \
+    modes, with the LP, Frank-Wolfe \
+    and core set solvers of the smallest enclosing circle, and checks \
+    that the radii agree")
+    parser.add_argument("-e", "--maxExponent",
+                        help="largest number of points, as a power of ten",
+                        type=int, default=7)
+    parser.add_argument("-l", "--maxLPSize",
+                        help="largest number of points given to the LP solver",
+                        type=int, default=10**4)
+    parser.add_argument("-f", "--maxFrankWolfeSize",
+                        help="largest number of points given to the \
+                        Frank-Wolfe solver",
+                        type=int, default=10**6)
+    parser.add_argument("-c", "--epsilon",
+                        help="relative error of the core set solver",
+                        type=float, default=1e-3)
+    parser.add_argument("-s", "--seed", help="seed of the generated points",
+                        type=int, default=0)
+    args = parser.parse_args()
+
+    r = 100 #radius of the disc in which lie the generated points
+    rng = numpy.random.default_rng(args.seed)
+
+    print("# n welzl(s) r robust(s) r lp(s) r frankWolfe(s) r coreSet(s) r")
+    for e in range(2, args.maxExponent+1):
+        n = 10**e
+        points = getPointsInDisc(n, r, rng)
+        if n <= args.maxLPSize:
+            pointSet = [tuple(p) for p in points]
+
+        circle, welzlTime = timeIt(lambda: getCircleByWelzl(points))
+        rWelzl = circle[2]
+        # every point must lie in the circle
+        d2 = (points[:,0] - circle[0])**2 + (points[:,1] - circle[1])**2
+        assert d2.max() <= rWelzl**2 * (1 + 1e-9)
+        line = f"{n} {welzlTime:.4f} {rWelzl:.6f}"
+
+        circle, robustTime = timeIt(lambda: getCircleByWelzl(points, robust=True))
+        # in robust mode, without any tolerance
+        assert numpy.hypot(points[:,0] - circle[0], points[:,1] - circle[1]).max() <= circle[2]
+        line += f" {robustTime:.4f} {circle[2]:.6f}"
+
+        for maxSize, solve in [(args.maxLPSize, lambda: solveByLP(pointSet)),
+                               (args.maxFrankWolfeSize,
+                                lambda: solveByFrankWolfe(points)),
+                               (n, lambda: solveByCoreSet(points, args.epsilon))]:
+            if n <= maxSize:
+                radius, solveTime = timeIt(solve)
+                if radius is None:
+                    line += f" {solveTime:.4f} failed"
+                else:
+                    line += f" {solveTime:.4f} {radius:.6f}"
+                    # relative gap with the exact radius
+                    line += f"({(radius - rWelzl)/rWelzl:+.1e})"
+            else:
+                line += " - -"
+        print(line, flush=True)
+
+#-------------------------------------------------------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+import sys
+import argparse
+import math
+import numpy
+from generateData import getPointsInDisc
+
+# number of directions of the extreme points used to cull the points
+NB_DIRECTIONS = 32
+
+#-------------------------------------------------------------
+def getExtremePoints(points, nbDirections=NB_DIRECTIONS):
+    """ Function that returns the points extreme in nbDirections
+    directions regularly spaced, in counterclockwise order and without
+    repetition. They are the vertices of a convex polygon inscribed in
+    the convex hull of the points.
+
+    :param: points, (n,2) numpy array
+    :return: (m,2) numpy array, m <= nbDirections
+    """
+    angles = 2 * math.pi * numpy.arange(nbDirections) / nbDirections
+    indices = [numpy.argmax(points[:,0]*math.cos(a) + points[:,1]*math.sin(a))
+               for a in angles]
+    polygon = points[indices]
+    # a point extreme in consecutive directions is kept once
+    distinct = numpy.any(polygon != numpy.roll(polygon, 1, axis=0), axis=1)
+    if not distinct.any():
+        return polygon[:1]
+    return polygon[distinct]
+
+#-------------------------------------------------------------
+def cullInteriorPoints(points, polygon):
+    """ Function that removes the points lying strictly inside a
+    convex polygon, as Akl and Toussaint did with the quadrilateral of
+    the extreme points in x and y: such points cannot be vertices of
+    the convex hull.
+
+    :param: points, (n,2) numpy array
+    :param: polygon, (m,2) numpy array of vertices in counterclockwise
+    order
+    :return: the remaining points
+    """
+    if polygon.shape[0] < 3:
+        return points
+    edges = numpy.roll(polygon, -1, axis=0) - polygon
+
+    # most points are first culled by a single test against a circle
+    # inscribed in the polygon, centered at the mean of its vertices
+    center = polygon.mean(axis=0)
+    distances = (edges[:,0]*(center[1]-polygon[:,1]) - edges[:,1]*(center[0]-polygon[:,0])) \
+        / numpy.hypot(edges[:,0], edges[:,1])
+    radius = distances.min()
+    if radius > 0:
+        d2 = (points[:,0]-center[0])**2 + (points[:,1]-center[1])**2
+        points = points[d2 >= radius**2]
+
+    inside = numpy.ones(points.shape[0], dtype=bool)
+    for a, e in zip(polygon, edges):
+        inside &= e[0]*(points[:,1]-a[1]) - e[1]*(points[:,0]-a[0]) > 0
+    return points[~inside]
+
+#-------------------------------------------------------------
+def cross(o, a, b):
+    return (a[0]-o[0])*(b[1]-o[1]) - (a[1]-o[1])*(b[0]-o[0])
+
+#-------------------------------------------------------------
+def getConvexHull(points):
+    """ Function that computes the convex hull of a set of points
+    with the monotone chain algorithm of Andrew, in O(n log(n)).
+    Points in the interior of the edges are not vertices.
+
+    :param: points, (n,2) numpy array
+    :return: (h,2) numpy array of the vertices in counterclockwise
+    order
+    """
+    points = numpy.unique(points, axis=0) # sorted by x then y
+    if points.shape[0] < 3:
+        return points
+    sortedPoints = [tuple(p) for p in points.tolist()]
+
+    def halfHull(chain):
+        hull = []
+        for p in chain:
+            while len(hull) >= 2 and cross(hull[-2], hull[-1], p) <= 0:
+                hull.pop()
+            hull.append(p)
+        return hull[:-1]
+
+    lower = halfHull(sortedPoints)
+    upper = halfHull(reversed(sortedPoints))
+    return numpy.array(lower + upper)
+
+#-------------------------------------------------------------
+def getHullPoints(pointSet, nbDirections=NB_DIRECTIONS):
+    """ Function that returns the vertices of the convex hull of a
+    set of points, the only ones that can define their smallest
+    enclosing circle. The points strictly inside the polygon of the
+    extreme points in nbDirections directions are first culled by
+    vectorized tests, so that few points are given to the hull
+    algorithm.
+
+    :param: pointSet, sequence of pairs (x,y) or (n,2) numpy array
+    :param: nbDirections, number of directions of the extreme points
+    :return: (h,2) numpy array of the vertices in counterclockwise
+    order
+    """
+    points = numpy.asarray(pointSet, dtype=float).reshape(-1, 2)
+    if points.shape[0] == 0:
+        raise ValueError
+    points = cullInteriorPoints(points, getExtremePoints(points, nbDirections))
+    return getConvexHull(points)
+
+#-------------------------------------------------------------
+def main():
+
+    #parse command line
+    parser = argparse.ArgumentParser(description="program that computes \
+    the convex hull of a set of points uniformly drawn in a disc and \
+    reports the reduction ratio of the number of points")
+    parser.add_argument("-n", "--number", help="number of points",
+                        type=int, default=100000)
+    parser.add_argument("-d", "--nbDirections",
+                        help="number of directions of the extreme points",
+                        type=int, default=NB_DIRECTIONS)
+    args = parser.parse_args()
+
+    r = 100 #radius of the disc in which lie the generated points
+    points = getPointsInDisc(args.number, r)
+
+    try:
+        polygon = getExtremePoints(points, args.nbDirections)
+        remaining = cullInteriorPoints(points, polygon)
+        hull = getConvexHull(remaining)
+    except ValueError:
+        print("Empty point set")
+        sys.exit(1)
+
+    print("#{} points, {} after culling, {} on the hull (ratio {:.1f})".format(
+        points.shape[0], remaining.shape[0], hull.shape[0],
+        points.shape[0] / hull.shape[0]))
+
+#-------------------------------------------------------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+
+import argparse
+import math
+import time
+import numpy
+from enclosingCircle import EPSILON, getCircleByWelzl
+from generateData import getPointsInDisc
+
+# relative tolerance telling whether a point lies on the circle, so
+# that every point defining the circle is kept in the support
+SUPPORT_TOLERANCE = 1e-9
+
+#-------------------------------------------------------------
+class DynamicEnclosingCircle(object):
+    """ Smallest enclosing circle of a set of points that changes by
+    insertions and deletions. The points are stored in a numpy array
+    (a deleted point is replaced by the last one) and the circle is
+    only recomputed, by Welzl's algorithm, when it may change:
+    - inserting a point inside the circle is O(1),
+    - deleting a point that is not on the circle is O(1),
+    - inserting a point outside the circle or deleting one of its
+      support points triggers an expected O(n) recomputation. """
+
+    def __init__(self, capacity=1024):
+        self.points = numpy.empty( (capacity, 2) )
+        self.ids = numpy.empty(capacity, dtype=numpy.int64)
+        self.rows = {} # row of each point in self.points
+        self.size = 0
+        self.nextId = 0
+        self.circle = None # (cx, cy, r^2)
+        self.support = set() # ids of the points on the circle
+        self.resetStatistics()
+
+    def __len__(self):
+        return self.size
+
+    def reserve(self, capacity):
+        """ Method that doubles the capacity of the arrays until it
+        reaches capacity. """
+        newCapacity = self.points.shape[0]
+        while newCapacity < capacity:
+            newCapacity *= 2
+        if newCapacity > self.points.shape[0]:
+            points = numpy.empty( (newCapacity, 2) )
+            ids = numpy.empty(newCapacity, dtype=numpy.int64)
+            points[:self.size] = self.points[:self.size]
+            ids[:self.size] = self.ids[:self.size]
+            self.points, self.ids = points, ids
+
+    def insert(self, x, y):
+        """ Method that adds the point (x,y).
+
+        :return: the id of the point, used to delete it
+        """
+        self.reserve(self.size + 1)
+        pointId = self.nextId
+        self.nextId += 1
+        self.points[self.size] = (x, y)
+        self.ids[self.size] = pointId
+        self.rows[pointId] = self.size
+        self.size += 1
+        self.nbInsertions += 1
+
+        if self.circle is None:
+            self.recompute()
+        else:
+            cx, cy, r2 = self.circle
+            if (x - cx)**2 + (y - cy)**2 > r2 * (1 + EPSILON):
+                self.recompute()
+        return pointId
+
+    def insertAll(self, pointSet):
+        """ Method that adds many points at once, the circle being
+        recomputed at most once.
+
+        :param: pointSet, (m,2) numpy array
+        :return: the list of the ids of the points
+        """
+        pointSet = numpy.asarray(pointSet, dtype=float).reshape(-1, 2)
+        m = pointSet.shape[0]
+        self.reserve(self.size + m)
+        pointIds = list(range(self.nextId, self.nextId + m))
+        self.points[self.size:self.size + m] = pointSet
+        self.ids[self.size:self.size + m] = pointIds
+        self.rows.update(zip(pointIds, range(self.size, self.size + m)))
+        self.size += m
+        self.nextId += m
+        self.nbInsertions += m
+
+        if self.circle is None:
+            self.recompute()
+        elif m > 0:
+            cx, cy, r2 = self.circle
+            d2 = (pointSet[:,0] - cx)**2 + (pointSet[:,1] - cy)**2
+            if (d2 > r2 * (1 + EPSILON)).any():
+                self.recompute()
+        return pointIds
+
+    def delete(self, pointId):
+        """ Method that removes a point.
+
+        :param: pointId, id returned by insert
+        """
+        row = self.rows.pop(pointId) # KeyError for an unknown id
+        last = self.size - 1
+        if row != last:
+            self.points[row] = self.points[last]
+            self.ids[row] = self.ids[last]
+            self.rows[int(self.ids[row])] = row
+        self.size -= 1
+        self.nbDeletions += 1
+
+        if pointId in self.support:
+            self.recompute()
+
+    def recompute(self):
+        """ Method that computes the circle and its support from
+        scratch. """
+        start = time.perf_counter()
+        if self.size == 0:
+            self.circle = None
+            self.support = set()
+        else:
+            points = self.points[:self.size]
+            cx, cy, r = getCircleByWelzl(points)
+            self.circle = (cx, cy, r**2)
+            d2 = (points[:,0] - cx)**2 + (points[:,1] - cy)**2
+            onCircle = d2 >= r**2 * (1 - SUPPORT_TOLERANCE)
+            self.support = set(self.ids[:self.size][onCircle].tolist())
+        self.nbRecomputations += 1
+        self.recomputationTime += time.perf_counter() - start
+
+    def getCircle(self):
+        """
+        :return: a triple (cx, cy, r), or None if there is no point
+        """
+        if self.circle is None:
+            return None
+        cx, cy, r2 = self.circle
+        return (cx, cy, math.sqrt(r2))
+
+    def resetStatistics(self):
+        """ Method that starts a new measure of the throughput. """
+        self.nbInsertions = 0
+        self.nbDeletions = 0
+        self.nbRecomputations = 0
+        self.recomputationTime = 0.
+        self.startTime = time.perf_counter()
+
+    def getStatistics(self):
+        """ Method that returns the throughput of the updates since
+        the creation of the structure or the last call to
+        resetStatistics.
+
+        :return: dict with the numbers of insertions, deletions and
+        recomputations, the number of updates per second and the share
+        of the time spent in recomputations
+        """
+        elapsed = time.perf_counter() - self.startTime
+        nbUpdates = self.nbInsertions + self.nbDeletions
+        return {"insertions": self.nbInsertions,
+                "deletions": self.nbDeletions,
+                "recomputations": self.nbRecomputations,
+                "updatesPerSecond": nbUpdates / elapsed,
+                "recomputationShare": self.recomputationTime / elapsed}
+
+#-------------------------------------------------------------
+def main():
+
+    #parse command line
+    parser = argparse.ArgumentParser(description="program that maintains \
+    the smallest enclosing circle of a set of points under a stream of \
+    random insertions and deletions and reports the throughput")
+    parser.add_argument("-n", "--number", help="initial number of points",
+                        type=int, default=100000)
+    parser.add_argument("-u", "--nbUpdates", help="number of updates",
+                        type=int, default=100000)
+    parser.add_argument("-d", "--deletionRate",
+                        help="probability that an update is a deletion",
+                        type=float, default=0.5)
+    parser.add_argument("-s", "--seed", help="seed of the generated points",
+                        type=int, default=0)
+    args = parser.parse_args()
+
+    r = 100 #radius of the disc in which lie the generated points
+    rng = numpy.random.default_rng(args.seed)
+
+    dynamicCircle = DynamicEnclosingCircle()
+    ids = dynamicCircle.insertAll(getPointsInDisc(args.number, r, rng))
+    dynamicCircle.resetStatistics()
+
+    newPoints = getPointsInDisc(args.nbUpdates, r, rng).tolist()
+    deletions = rng.random(args.nbUpdates) < args.deletionRate
+    choices = rng.random(args.nbUpdates)
+    for (x, y), deletion, choice in zip(newPoints, deletions, choices):
+        if deletion and ids:
+            # the deleted id is swapped with the last one of the list
+            i = int(choice * len(ids))
+            ids[i], ids[-1] = ids[-1], ids[i]
+            dynamicCircle.delete(ids.pop())
+        else:
+            ids.append(dynamicCircle.insert(x, y))
+
+    statistics = dynamicCircle.getStatistics()
+    print("#{insertions} insertions, {deletions} deletions, "
+          "{recomputations} recomputations: {updatesPerSecond:.0f} updates/s, "
+          "{recomputationShare:.1%} of the time recomputing".format(**statistics))
+
+    circle = dynamicCircle.getCircle()
+    if circle is None:
+        print("#no points left")
+        return
+    cx, cy, radius = circle
+    print("#cx={}, cy={}, r={}, r from scratch={}".format(
+        cx, cy, radius, getCircleByWelzl(dynamicCircle.points[:len(dynamicCircle)])[2]))
+
+#-------------------------------------------------------------
+if __name__ == "__main__":
+    main()
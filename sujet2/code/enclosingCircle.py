@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+
+import sys
+import argparse
+import itertools
+import math
+from fractions import Fraction
+import numpy
+from convexHull import getHullPoints
+from predicates import EPS, orientation, isOutside, isOutsideOfArray
+from generateData import getPointsInDisc
+
+# relative tolerance of the test telling whether a point lies
+# outside a circle
+EPSILON = 1e-10
+# below this number of points, the points are scanned one by one
+# rather than by numpy blocks, whose overhead would dominate
+SMALL_SIZE = 256
+# number of lines read at once from a point file
+CHUNK_SIZE = 1 << 20
+# number of directions in which the extreme points of a stream are kept
+NB_DIRECTIONS = 8
+
+#-------------------------------------------------------------
+def circleFromTwoPoints(p, q):
+    """ Function that returns the smallest circle through p and q,
+    as a triple (cx, cy, r^2). """
+    cx = (p[0] + q[0]) / 2
+    cy = (p[1] + q[1]) / 2
+    return (cx, cy, (p[0]-cx)**2 + (p[1]-cy)**2)
+
+#-------------------------------------------------------------
+def circleFromThreePoints(p, q, s):
+    """ Function that returns the circle through p, q and s, as a
+    triple (cx, cy, r^2). If the three points are collinear, the
+    circle having the two farthest points as diameter is returned. """
+    bx, by = q[0] - p[0], q[1] - p[1]
+    cx, cy = s[0] - p[0], s[1] - p[1]
+    d = 2 * (bx * cy - by * cx)
+    if d == 0:
+        pairs = [(p, q), (p, s), (q, s)]
+        return max((circleFromTwoPoints(a, b) for a, b in pairs),
+                   key=lambda circle: circle[2])
+    b2 = bx**2 + by**2
+    c2 = cx**2 + cy**2
+    ux = (cy * b2 - by * c2) / d
+    uy = (bx * c2 - cx * b2) / d
+    return (p[0] + ux, p[1] + uy, ux**2 + uy**2)
+
+#-------------------------------------------------------------
+def getCircleThrough(*support):
+    """ Function that returns the smallest circle through one, two or
+    three points, as a triple (cx, cy, r^2). """
+    if len(support) == 1:
+        return (support[0][0], support[0][1], 0.)
+    if len(support) == 2:
+        return circleFromTwoPoints(*support)
+    return circleFromThreePoints(*support)
+
+#-------------------------------------------------------------
+def getSupport(*support):
+    """ Function that returns the support of the smallest circle
+    through one, two or three points, as expected by the exact
+    predicates: three points are put in counterclockwise order and,
+    if they are collinear, only the two farthest ones are kept. """
+    if len(support) < 3:
+        return support
+    p, q, s = support
+    o = orientation(p, q, s)
+    if o > 0:
+        return (p, q, s)
+    if o < 0:
+        return (p, s, q)
+
+    def squaredLength(pair):
+        a, b = pair
+        return (Fraction(a[0]) - Fraction(b[0]))**2 + (Fraction(a[1]) - Fraction(b[1]))**2
+    return max([(p, q), (p, s), (q, s)], key=squaredLength)
+
+#-------------------------------------------------------------
+def getEnclosingCircleOfSupport(support):
+    """ Function that returns a circle with a floating point center
+    containing the exact circle defined by a support, as returned by
+    getSupport: the center c' is rounded, so the radius is the exact
+    radius R plus the distance from c' to the exact center c, rounded
+    up with a margin covering the rounding errors of the computation
+    of the distances to c'.
+
+    :return: a triple (cx, cy, r)
+    """
+    cx, cy, _ = getCircleThrough(*support)
+    exactSupport = [(Fraction(p[0]), Fraction(p[1])) for p in support]
+    ecx, ecy, r2 = getCircleThrough(*exactSupport)
+    delta2 = (ecx - Fraction(cx))**2 + (ecy - Fraction(cy))**2
+    r = (math.sqrt(r2) + math.sqrt(delta2)) * (1 + 16 * EPS)
+    return (float(cx), float(cy), math.nextafter(r, math.inf))
+
+#-------------------------------------------------------------
+def firstOutsideOfArray(points, start, end, circle, robust=False):
+    """ Function that returns the index of the first point of
+    points[start:end] lying outside circle, or end if there is none.
+    The points are scanned by blocks of increasing size, so that the
+    cost is proportional to the number of points actually scanned.
+    In robust mode, circle is a support as returned by getSupport and
+    the points are tested by the exact predicates.
+    """
+    if not robust:
+        cx, cy, r2 = circle
+        bound = r2 * (1 + EPSILON)
+    blockSize = 256
+    while start < end:
+        block = points[start:min(start + blockSize, end)]
+        if robust:
+            outside = numpy.flatnonzero(isOutsideOfArray(circle, block))
+        else:
+            d2 = (block[:,0] - cx)**2 + (block[:,1] - cy)**2
+            outside = numpy.flatnonzero(d2 > bound)
+        if outside.shape[0] > 0:
+            return start + outside[0]
+        start += block.shape[0]
+        blockSize *= 2
+    return end
+
+#-------------------------------------------------------------
+def firstOutsideOfList(points, start, end, circle, robust=False):
+    """ Same as firstOutsideOfArray, for a list of pairs. """
+    if robust:
+        for i in range(start, end):
+            if isOutside(circle, points[i]):
+                return i
+        return end
+    cx, cy, r2 = circle
+    bound = r2 * (1 + EPSILON)
+    for i in range(start, end):
+        x, y = points[i]
+        if (x - cx)**2 + (y - cy)**2 > bound:
+            return i
+    return end
+
+#-------------------------------------------------------------
+def getCircleByWelzl(pointSet, seed=None, robust=False):
+    """ Function that computes the smallest enclosing circle of a set
+    of 2d points with the randomized incremental algorithm of Welzl,
+    in expected linear time. Points are processed in random order
+    and, each time one of them lies outside the current circle, the
+    circle is recomputed with this point on its boundary.
+
+    In robust mode, the circles are kept as their support points and
+    the tests are exact (see predicates.py), so that the support of
+    the returned circle is exact even for points far from the origin,
+    such as GPS coordinates; its center is rounded and its radius is
+    rounded up so that every point lies in the returned circle.
+
+    :param: pointSet, sequence of pairs (x,y) or (n,2) numpy array
+    :param: seed, seed of the random permutation of the points
+    :param: robust, use the exact predicates
+    :return: a triple (cx, cy, r) as returned by toCircle
+    """
+    points = numpy.asarray(pointSet, dtype=float).reshape(-1, 2)
+    n = points.shape[0]
+    if n == 0:
+        raise ValueError
+    points = points[numpy.random.default_rng(seed).permutation(n)]
+    if n < SMALL_SIZE:
+        points = points.tolist()
+        scan = firstOutsideOfList
+    else:
+        scan = firstOutsideOfArray
+    makeCircle = getSupport if robust else getCircleThrough
+
+    def firstOutside(points, start, end, circle):
+        return scan(points, start, end, circle, robust)
+
+    circle = makeCircle(points[0])
+    i = firstOutside(points, 1, n, circle)
+    while i < n:
+        # points[i] is on the boundary of the circle of points[:i+1]
+        p = points[i]
+        circle = makeCircle(p, points[0])
+        j = firstOutside(points, 1, i, circle)
+        while j < i:
+            # points[i] and points[j] are on the boundary
+            q = points[j]
+            circle = makeCircle(p, q)
+            k = firstOutside(points, 0, j, circle)
+            while k < j:
+                circle = makeCircle(p, q, points[k])
+                k = firstOutside(points, k+1, j, circle)
+            j = firstOutside(points, j+1, i, circle)
+        i = firstOutside(points, i+1, n, circle)
+
+    if robust:
+        return getEnclosingCircleOfSupport(circle)
+    cx, cy, r2 = circle
+    return (float(cx), float(cy), math.sqrt(r2))
+
+#-------------------------------------------------------------
+def getFieldsPerLine(text):
+    """ Function that counts, without any python loop, the
+    space-delimited fields of each line of a text, as
+    checkFieldsPerLine of TD-regression/code/dataLoader.py.
+
+    :param: text, bytes
+    :return: numpy array of the number of fields of each line
+    """
+    c = numpy.frombuffer(text, dtype=numpy.uint8)
+    isSpace = (c == ord(" ")) | (c == ord("\t")) | (c == ord("\r")) \
+        | (c == ord("\n"))
+    #a field starts at a non-space byte following a space byte
+    fieldStarts = numpy.flatnonzero(~isSpace & numpy.concatenate( ([True], isSpace[:-1]) ))
+    newlines = numpy.flatnonzero(c == ord("\n"))
+    nbLines = newlines.shape[0] + (c.shape[0] > 0 and c[-1] != ord("\n"))
+    return numpy.bincount(numpy.searchsorted(newlines, fieldStarts),
+                          minlength=nbLines)
+
+#-------------------------------------------------------------
+def iterateChunks(file, chunkSize=CHUNK_SIZE):
+    """ Generator reading a text file of points, one pair x y per
+    line, by chunks of chunkSize lines.
+
+    :param: file, file object, possibly sys.stdin
+    :return: (m,2) numpy arrays
+    :raise: ValueError if a line does not contain two numbers
+    """
+    while True:
+        lines = list(itertools.islice(file, chunkSize))
+        if not lines:
+            return
+        text = "".join(lines)
+        #each line must contain exactly two fields
+        fieldsPerLine = getFieldsPerLine(text.encode())
+        if fieldsPerLine.shape[0] != len(lines) or numpy.any(fieldsPerLine != 2):
+            raise ValueError()
+        values = numpy.fromstring(text, sep=" ")
+        if values.shape[0] != 2 * len(lines):
+            raise ValueError()
+        yield values.reshape(-1, 2)
+
+#-------------------------------------------------------------
+def getCircleByStreaming(chunks):
+    """ Function that computes in one pass and constant memory a
+    circle enclosing a stream of points, within a factor 3/2 of the
+    smallest one (Zarrabi-Zadeh and Chan): each time a point lies
+    outside the current circle, the circle is replaced by the smallest
+    one enclosing both of them. The extreme points of the stream in
+    NB_DIRECTIONS directions are also kept: their smallest enclosing
+    circle is a lower bound.
+
+    :param: chunks, iterable of (m,2) numpy arrays
+    :return: the enclosing circle (cx, cy, r) and the (2*NB_DIRECTIONS,2)
+    numpy array of the extreme points
+    """
+    angles = numpy.pi * numpy.arange(NB_DIRECTIONS) / NB_DIRECTIONS
+    directions = numpy.column_stack( (numpy.cos(angles), numpy.sin(angles)) )
+    circle = extremes = None
+    for chunk in chunks:
+        if chunk.shape[0] == 0:
+            continue
+        if circle is None:
+            circle = (chunk[0,0], chunk[0,1], 0.)
+            extremes = numpy.repeat(chunk[:1], 2*NB_DIRECTIONS, axis=0)
+
+        # extreme points of the chunk, kept if farther than the current ones
+        candidates = numpy.vstack( (extremes, chunk) )
+        projections = candidates @ directions.T
+        extremes = candidates[numpy.concatenate( (projections.argmax(axis=0),
+                                                  projections.argmin(axis=0)) )]
+
+        i = firstOutsideOfArray(chunk, 0, chunk.shape[0], circle)
+        while i < chunk.shape[0]:
+            cx, cy, r2 = circle
+            r = math.sqrt(r2)
+            d = math.hypot(chunk[i,0] - cx, chunk[i,1] - cy)
+            newR = (r + d) / 2
+            cx += (newR - r) * (chunk[i,0] - cx) / d
+            cy += (newR - r) * (chunk[i,1] - cy) / d
+            circle = (cx, cy, newR**2)
+            i = firstOutsideOfArray(chunk, i+1, chunk.shape[0], circle)
+
+    if circle is None:
+        raise ValueError
+    cx, cy, r2 = circle
+    return (float(cx), float(cy), math.sqrt(r2)), extremes
+
+#-------------------------------------------------------------
+def getCircleOfFile(path, chunkSize=CHUNK_SIZE):
+    """ Function that computes the smallest enclosing circle of the
+    points of a text file that may not fit in memory. After the
+    streaming pass, the exact circle of a small set of candidate
+    points, initially the extreme points, is refined by other passes:
+    the points lying outside the current circle are added to the
+    candidates, and only the candidates on the boundary of the new
+    circle are kept. The passes stop when no point lies outside,
+    usually after the second one.
+
+    :param: path, path to the text file, one pair x y per line
+    :param: chunkSize, number of lines read at once
+    :return: the circle (cx, cy, r) and the number of passes
+    """
+    with open(path) as file:
+        _, candidates = getCircleByStreaming(iterateChunks(file, chunkSize))
+    circle = getCircleByWelzl(candidates)
+
+    nbPasses = 1
+    changed = True
+    while changed:
+        changed = False
+        nbPasses += 1
+        with open(path) as file:
+            for chunk in iterateChunks(file, chunkSize):
+                cx, cy, r = circle
+                d2 = (chunk[:,0] - cx)**2 + (chunk[:,1] - cy)**2
+                outside = chunk[d2 > r**2 * (1 + EPSILON)]
+                if outside.shape[0] > 0:
+                    candidates = numpy.vstack( (candidates, outside) )
+                    circle = getCircleByWelzl(candidates)
+                    cx, cy, r = circle
+                    d2 = (candidates[:,0] - cx)**2 + (candidates[:,1] - cy)**2
+                    candidates = candidates[d2 >= r**2 * (1 - EPSILON)]
+                    changed = True
+
+    return circle, nbPasses
+
+#-------------------------------------------------------------
+def main():
+
+    #parse command line
+    parser = argparse.ArgumentParser(description="program that computes \
+    the smallest enclosing circle of a set of 2d points with Welzl's \
+    algorithm")
+    parser.add_argument("-n", "--number", help="number of points",
+                        type=int, default=100)
+    parser.add_argument("-i", "--input",
+                        help="text file of points, one pair x y per line, \
+                        read by chunks instead of generating the points; \
+                        with '-', the standard input is read in one pass \
+                        and an approximate circle is given")
+    parser.add_argument("-r", "--robust",
+                        help="test the points with exact predicates",
+                        action="store_true")
+    parser.add_argument("-c", "--convexHull",
+                        help="only give the vertices of the convex hull to the solver",
+                        action="store_true")
+    parser.add_argument("-w", "--visualize", help="show the scatter plot of the data",
+                        action="store_true")
+    args = parser.parse_args()
+
+    if args.input is not None:
+        try:
+            if args.input == "-":
+                (cx, cy, radius), extremes = getCircleByStreaming(iterateChunks(sys.stdin))
+                lowerBound = getCircleByWelzl(extremes)[2]
+                print("#cx={}, cy={}, r={}, smallest r>={}".format(cx, cy, radius,
+                                                                   lowerBound))
+            else:
+                (cx, cy, radius), nbPasses = getCircleOfFile(args.input)
+                print("#cx={}, cy={}, r={}, passes={}".format(cx, cy, radius,
+                                                              nbPasses))
+        except ValueError:
+            print("Empty point set or could not convert data")
+            sys.exit(1)
+        return
+
+    #constants
+    n = args.number #number of points
+    r = 100 #radius of the disc in which lie the generated points
+
+    try:
+        #input data generation
+        pointSet = getPointsInDisc(n, r) #point set (rows are pairs of coordinates (x,y))
+
+        if args.convexHull:
+            hull = getHullPoints(pointSet)
+            print("#convex hull of {} out of {} points (ratio {:.1f})".format(
+                len(hull), len(pointSet), len(pointSet) / len(hull)))
+            pointSet = hull
+
+        #solve
+        cx, cy, radius = getCircleByWelzl(pointSet, robust=args.robust)
+        print("#cx={}, cy={}, r={}".format(cx, cy, radius))
+
+    except ValueError:
+        print("Empty point set")
+        sys.exit(1)
+
+    #visualizing data
+    if args.visualize:
+
+        import matplotlib.pyplot as plt
+
+        #data points
+        x = [x for (x,_) in pointSet]
+        y = [y for (_,y) in pointSet]
+        plt.scatter(x, y, color = "red", marker = '+')
+        #computed solution
+        circle = plt.Circle((cx, cy), radius, color='b', fill=False)
+        plt.gca().add_patch(circle)
+        plt.gca().set_aspect("equal")
+        #labels
+        plt.xlabel("x")
+        plt.ylabel("y")
+        plt.show()
+        plt.close()
+
+#-------------------------------------------------------------
+if __name__ == "__main__":
+    main()
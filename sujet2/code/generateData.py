@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import argparse
+import importlib.util
+import math
+import numpy
+
+#-------------------------------------------------------------
+def loadBinaryFormat():
+    """ Function that imports TD-regression/code/binaryFormat.py,
+    which is not in this directory, so that the files written here
+    have the header read by TD-regression/code/dataLoader.py. """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "..", "..", "TD-regression", "code", "binaryFormat.py")
+    spec = importlib.util.spec_from_file_location("binaryFormat", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+binaryFormat = loadBinaryFormat()
+BINARY_MAGIC = binaryFormat.BINARY_MAGIC
+BINARY_HEADER = binaryFormat.BINARY_HEADER
+
+# number of points generated at once
+BLOCK_SIZE = 1 << 20
+
+#-------------------------------------------------------------
+def getPointsInDisc(n, r=100., rng=None):
+    """ Function that draws points uniformly in the disc of center
+    (r,r) and radius r, as the rejection sampling of the enclosing
+    circle scripts, but without any rejection: the radius is
+    r sqrt(U) for U uniform in [0,1).
+
+    :param: n, number of points
+    :param: r, radius of the disc
+    :param: rng, numpy random generator
+    :return: (n,2) numpy array of the points x y
+    """
+    rng = numpy.random.default_rng() if rng is None else rng
+    radius = r * numpy.sqrt(rng.random(n))
+    angle = 2 * math.pi * rng.random(n)
+    return numpy.column_stack( (r + radius*numpy.cos(angle),
+                                r + radius*numpy.sin(angle)) )
+
+#-------------------------------------------------------------
+def getPointsAroundLine(n, slope=1., intercept=0., minDistance=0.5,
+                        maxDistance=3.5, lowerBound=-2.5, upperBound=2.5,
+                        rng=None):
+    """ Function that draws labelled points in a band around a
+    straight line: the label is 1 or -1 with the same probability and
+    the points of label 1 (resp. -1) are above (resp. below) the
+    line, at a vertical distance uniform in [minDistance, maxDistance].
+
+    :param: n, number of points
+    :param: lowerBound, upperBound, range of the x-coordinates
+    :param: rng, numpy random generator
+    :return: (n,3) numpy array of the points x y label
+    """
+    rng = numpy.random.default_rng() if rng is None else rng
+    x = rng.uniform(lowerBound, upperBound, n)
+    label = numpy.where(rng.random(n) < 0.5, -1., 1.)
+    shift = label * rng.uniform(minDistance, maxDistance, n)
+    return numpy.column_stack( (x, slope * x + intercept + shift, label) )
+
+#-------------------------------------------------------------
+def getPointsNearLine(n, slope=0.5, intercept=0., sigma=0.01,
+                      lowerBound=0., upperBound=5., rng=None):
+    """ Function that draws regression data: y = slope x + intercept
+    plus a gaussian noise of standard deviation sigma.
+
+    :param: n, number of points
+    :param: lowerBound, upperBound, range of the x-coordinates
+    :param: rng, numpy random generator
+    :return: (n,2) numpy array of the points x y
+    """
+    rng = numpy.random.default_rng() if rng is None else rng
+    x = rng.uniform(lowerBound, upperBound, n)
+    return numpy.column_stack( (x, slope * x + intercept + rng.normal(0, sigma, n)) )
+
+#-------------------------------------------------------------
+def iterateBlocks(generate, n, seed=None, **parameters):
+    """ Generator drawing n points by blocks of BLOCK_SIZE points, so
+    that the memory does not depend on n. For a given seed, the points
+    are the same whatever the way they are written.
+
+    :param: generate, one of the functions above
+    :param: n, number of points
+    :param: seed, seed of the numpy random generator
+    :param: parameters, parameters of generate
+    :return: numpy arrays of at most BLOCK_SIZE rows
+    """
+    rng = numpy.random.default_rng(seed)
+    for start in range(0, n, BLOCK_SIZE):
+        yield generate(min(BLOCK_SIZE, n - start), rng=rng, **parameters)
+
+#-------------------------------------------------------------
+def writeText(file, blocks, digits=17):
+    """ Function that writes the points, one per line, formatting a
+    whole block at once.
+
+    :param: file, text file object
+    :param: blocks, iterable of 2d numpy arrays
+    :param: digits, number of significant digits
+    """
+    for block in blocks:
+        line = " ".join(["%.{}g".format(digits)] * block.shape[1]) + "\n"
+        file.write((line * block.shape[0]) % tuple(block.ravel().tolist()))
+
+#-------------------------------------------------------------
+def writeBinary(path, blocks, n, nbCols, dtype=numpy.float32):
+    """ Function that writes the points in the binary format read by
+    TD-regression/code/dataLoader.py, the file being memory-mapped so
+    that each block is copied at its place in every column.
+
+    :param: path, path to the file to write
+    :param: blocks, iterable of (m,nbCols) numpy arrays, n rows in all
+    :param: n, number of points
+    :param: nbCols, number of fields per point
+    :param: dtype, numpy.float32 or numpy.float64
+    """
+    itemSize = numpy.dtype(dtype).itemsize
+    with open(path, 'wb') as dataFile:
+        dataFile.write(BINARY_HEADER.pack(BINARY_MAGIC, n, nbCols, itemSize))
+        dataFile.truncate(BINARY_HEADER.size + n * nbCols * itemSize)
+    if n == 0:
+        return
+    columns = numpy.memmap(path, dtype=dtype, mode='r+',
+                           offset=BINARY_HEADER.size, shape=(nbCols, n))
+    start = 0
+    for block in blocks:
+        columns[:, start:start + block.shape[0]] = block.T
+        start += block.shape[0]
+    columns.flush()
+    del columns
+
+#-------------------------------------------------------------
+def main():
+
+    #parse command line
+    parser = argparse.ArgumentParser(description="\
+    generates a point cloud (uniform in a disc, in a band around a \
+    straight line or regression data near a straight line) and writes \
+    it to the standard output, or to a file in text or binary format")
+
+    parser.add_argument("-k", "--kind",
+                        help="distribution of the points: 'disc' (x y), \
+                        'band' (x y label) or 'regression' (x y)",
+                        choices=["disc", "band", "regression"],
+                        default="disc")
+    parser.add_argument("-n", "--number",
+                        help="number of samples",
+                        type=int,
+                        default=1000)
+    parser.add_argument("-r", "--radius",
+                        help="radius of the disc",
+                        type=float,
+                        default=100.)
+    parser.add_argument("-a", "--slope",
+                        help="slope of the straight line",
+                        type=float)
+    parser.add_argument("-b", "--intercept",
+                        help="intercept of the straight line",
+                        type=float)
+    parser.add_argument("-m", "--minDistance",
+                        help="minimal vertical distance to the straight line",
+                        type=float)
+    parser.add_argument("-M", "--maxDistance",
+                        help="maximal vertical distance to the straight line",
+                        type=float)
+    parser.add_argument("-s", "--sigma",
+                        help="standard deviation of the y-coordinate predication error",
+                        type=float)
+    parser.add_argument("-l", "--lowerBound",
+                        help="minimal x-coordinate",
+                        type=float)
+    parser.add_argument("-u", "--upperBound",
+                        help="maximal x-coordinate",
+                        type=float)
+    parser.add_argument("--seed",
+                        help="seed of the random generator",
+                        type=int)
+    parser.add_argument("-o", "--output",
+                        help="path to the output file instead of the standard output")
+    parser.add_argument("--binary",
+                        help="write the output file in the binary format of \
+                        TD-regression/code/dataLoader.py",
+                        action="store_true")
+    parser.add_argument("-p", "--precision",
+                        help="number of significant digits of the text \
+                        output, or 32 or 64 bits floats for the binary output",
+                        type=int)
+    parser.add_argument("-w", "--visualize", help="show the scatter plot of the point cloud",
+                        action="store_true")
+    args = parser.parse_args()
+
+    if args.kind == "disc":
+        generate, parameters, nbCols = getPointsInDisc, {"r": args.radius}, 2
+    elif args.kind == "band":
+        generate, nbCols = getPointsAroundLine, 3
+        parameters = {"slope": args.slope, "intercept": args.intercept,
+                      "minDistance": args.minDistance, "maxDistance": args.maxDistance,
+                      "lowerBound": args.lowerBound, "upperBound": args.upperBound}
+    else:
+        generate, nbCols = getPointsNearLine, 2
+        parameters = {"slope": args.slope, "intercept": args.intercept,
+                      "sigma": args.sigma,
+                      "lowerBound": args.lowerBound, "upperBound": args.upperBound}
+    #default values of the generating function for the missing options
+    parameters = {key: value for key, value in parameters.items() if value is not None}
+    blocks = iterateBlocks(generate, args.number, args.seed, **parameters)
+    if args.visualize:
+        #the points are kept to be shown
+        blocks = list(blocks)
+
+    if args.binary:
+        if args.output is None:
+            print("The binary format requires an output file")
+            sys.exit(1)
+        if args.precision not in (None, 32, 64):
+            print("The binary format stores 32 or 64 bits floats")
+            sys.exit(1)
+        dtype = numpy.float64 if args.precision == 64 else numpy.float32
+        writeBinary(args.output, blocks, args.number, nbCols, dtype)
+    else:
+        digits = 17 if args.precision is None else args.precision
+        if args.output is None:
+            writeText(sys.stdout, blocks, digits)
+        else:
+            with open(args.output, 'w') as outputFile:
+                writeText(outputFile, blocks, digits)
+
+    #visualizing data
+    if args.visualize:
+
+        import matplotlib.pyplot as plt
+
+        data = numpy.concatenate(blocks)
+        if args.kind == "band":
+            plt.scatter(data[data[:,2] == 1, 0], data[data[:,2] == 1, 1], marker = '+')
+            plt.scatter(data[data[:,2] == -1, 0], data[data[:,2] == -1, 1], marker = '.')
+        else:
+            plt.scatter(data[:,0], data[:,1], marker = '.')
+        if args.kind == "disc":
+            plt.gca().set_aspect("equal")
+        plt.show()
+        plt.close()
+
+#-------------------------------------------------------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+from fractions import Fraction
+import numpy
+
+#-------------------------------------------------------------
+# Geometric predicates with a floating point fast path and an exact
+# fallback, in the style of Shewchuk: the sign of a determinant is
+# computed in floating point together with a bound of its rounding
+# error, and recomputed with exact rationals only when the bound
+# does not tell the sign.
+
+# machine epsilon of the round-to-nearest doubles
+EPS = 2.0 ** -53
+# error bounds of Shewchuk for orient2d and incircle, and for the dot
+# product of two differences
+CCW_ERRBOUND = (3 + 16 * EPS) * EPS
+ICC_ERRBOUND = (10 + 96 * EPS) * EPS
+DOT_ERRBOUND = (4 + 32 * EPS) * EPS
+
+#-------------------------------------------------------------
+def sign(x):
+    return int(x > 0) - int(x < 0)
+
+#-------------------------------------------------------------
+def exactOrientation(a, b, c):
+    ax, ay, bx, by, cx, cy = map(Fraction, (a[0], a[1], b[0], b[1], c[0], c[1]))
+    return sign((ax - cx) * (by - cy) - (ay - cy) * (bx - cx))
+
+#-------------------------------------------------------------
+def orientation(a, b, c):
+    """ Function that returns 1 if a, b, c are in counterclockwise
+    order, -1 if they are in clockwise order and 0 if they are
+    collinear. """
+    detLeft = (a[0] - c[0]) * (b[1] - c[1])
+    detRight = (a[1] - c[1]) * (b[0] - c[0])
+    det = detLeft - detRight
+    if abs(det) > CCW_ERRBOUND * (abs(detLeft) + abs(detRight)):
+        return sign(det)
+    return exactOrientation(a, b, c)
+
+#-------------------------------------------------------------
+def exactDiametral(p, q, s):
+    px, py, qx, qy, sx, sy = map(Fraction, (p[0], p[1], q[0], q[1], s[0], s[1]))
+    return sign((sx - px) * (sx - qx) + (sy - py) * (sy - qy))
+
+#-------------------------------------------------------------
+def exactInCircle(a, b, c, d):
+    adx, ady = Fraction(a[0]) - Fraction(d[0]), Fraction(a[1]) - Fraction(d[1])
+    bdx, bdy = Fraction(b[0]) - Fraction(d[0]), Fraction(b[1]) - Fraction(d[1])
+    cdx, cdy = Fraction(c[0]) - Fraction(d[0]), Fraction(c[1]) - Fraction(d[1])
+    return sign((adx**2 + ady**2) * (bdx * cdy - cdx * bdy)
+                + (bdx**2 + bdy**2) * (cdx * ady - adx * cdy)
+                + (cdx**2 + cdy**2) * (adx * bdy - bdx * ady))
+
+#-------------------------------------------------------------
+def getDiametral(p, q, x, y):
+    """ Function that returns the dot product (s-p).(s-q) for the
+    points s of coordinates x, y (floats or numpy arrays), positive if
+    and only if s lies outside the circle of diameter pq, and the
+    bound of its rounding error. """
+    ax, ay = x - p[0], y - p[1]
+    bx, by = x - q[0], y - q[1]
+    left, right = ax * bx, ay * by
+    return left + right, DOT_ERRBOUND * (abs(left) + abs(right))
+
+#-------------------------------------------------------------
+def getInCircle(a, b, c, x, y):
+    """ Function that returns the incircle determinant of a, b, c and
+    the points d of coordinates x, y (floats or numpy arrays),
+    positive if and only if d lies inside the circle through a, b, c
+    in counterclockwise order, and the bound of its rounding error. """
+    adx, ady = a[0] - x, a[1] - y
+    bdx, bdy = b[0] - x, b[1] - y
+    cdx, cdy = c[0] - x, c[1] - y
+
+    bdxcdy, cdxbdy = bdx * cdy, cdx * bdy
+    alift = adx * adx + ady * ady
+    cdxady, adxcdy = cdx * ady, adx * cdy
+    blift = bdx * bdx + bdy * bdy
+    adxbdy, bdxady = adx * bdy, bdx * ady
+    clift = cdx * cdx + cdy * cdy
+
+    det = alift * (bdxcdy - cdxbdy) + blift * (cdxady - adxcdy) \
+        + clift * (adxbdy - bdxady)
+    permanent = (abs(bdxcdy) + abs(cdxbdy)) * alift \
+        + (abs(cdxady) + abs(adxcdy)) * blift \
+        + (abs(adxbdy) + abs(bdxady)) * clift
+    return det, ICC_ERRBOUND * permanent
+
+#-------------------------------------------------------------
+def isOutside(support, s):
+    """ Function that tells exactly whether the point s lies outside
+    the circle defined by its support: one point (circle of radius
+    zero), two points (circle of diameter pq) or three points in
+    counterclockwise order (circle through them). Points on the
+    circle are not outside.
+
+    :param: support, tuple of one, two or three pairs (x,y)
+    :param: s, pair (x,y)
+    :return: a boolean
+    """
+    if len(support) == 1:
+        return s[0] != support[0][0] or s[1] != support[0][1]
+    if len(support) == 2:
+        det, bound = getDiametral(*support, s[0], s[1])
+        if abs(det) > bound:
+            return det > 0
+        return exactDiametral(*support, s) > 0
+    det, bound = getInCircle(*support, s[0], s[1])
+    if abs(det) > bound:
+        return det < 0
+    return exactInCircle(*support, s) < 0
+
+#-------------------------------------------------------------
+def isOutsideOfArray(support, points):
+    """ Same as isOutside, vectorized over the rows of a (m,2) numpy
+    array: only the points whose sign is not certain in floating
+    point are tested exactly.
+
+    :return: (m) boolean numpy array
+    """
+    if len(support) == 1:
+        p = support[0]
+        return (points[:,0] != p[0]) | (points[:,1] != p[1])
+    if len(support) == 2:
+        det, bound = getDiametral(*support, points[:,0], points[:,1])
+        outside = det > bound
+    else:
+        det, bound = getInCircle(*support, points[:,0], points[:,1])
+        outside = det < -bound
+    for i in numpy.flatnonzero(numpy.abs(det) <= bound):
+        outside[i] = isOutside(support, points[i])
+    return outside
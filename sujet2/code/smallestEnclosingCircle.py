@@ -2,9 +2,10 @@
 
 import sys
 import argparse
-import random
 import math
 import numpy
+from convexHull import getHullPoints
+from generateData import getPointsInDisc
 import scipy.optimize
 
 #-------------------------------------------------------------
@@ -17,7 +18,7 @@ def getSolution(c, A_ub, b_ub, A_eq, b_eq, bds):
     res = scipy.optimize.linprog(c, A_ub=A_ub, b_ub=b_ub,
                                  A_eq=A_eq, b_eq=b_eq,
                                  bounds=bds,
-                                 method='revised simplex')
+                                 method='highs')
     print(res)
 
     return res
@@ -72,26 +73,28 @@ def main():
     #parse command line    
     parser = argparse.ArgumentParser(description="program that computes \
     the smallest enclosing circle of a set of 2d points")
+    parser.add_argument("-n", "--number", help="number of points",
+                        type=int, default=100)
+    parser.add_argument("-c", "--convexHull",
+                        help="only give the vertices of the convex hull to the solver",
+                        action="store_true")
     parser.add_argument("-w", "--visualize", help="show the scatter plot of the data",
                         action="store_true")
     args = parser.parse_args()
 
     #constants
-    n = 100 #number of points
+    n = args.number #number of points
     r = 100 #radius of the disc in which lie the generated points
     
     try:
         #input data generation
-        pointSet = [] #point set (points are pairs of coordinates (x,y))
-        random.seed()
-        for i in range(n):
-            accepted = False
-            while not accepted: 
-                x = random.random()*2*r
-                y = random.random()*2*r
-                if (x-r)**2 + (y-r)**2 <= r**2: 
-                    accepted = True
-            pointSet.append((x,y))
+        pointSet = getPointsInDisc(n, r) #point set (rows are pairs of coordinates (x,y))
+
+        if args.convexHull:
+            hull = getHullPoints(pointSet)
+            print("#convex hull of {} out of {} points (ratio {:.1f})".format(
+                len(hull), len(pointSet), len(pointSet) / len(hull)))
+            pointSet = hull
 
         # #initial solution
         # dmax = 0
@@ -2,95 +2,167 @@
 
 import sys
 import argparse
-import random
 import math
 import numpy
-import scipy.optimize
+from convexHull import getHullPoints
+from generateData import getPointsInDisc
 
 #-------------------------------------------------------------
-class SolverError(Exception):
-    pass
+def toArray(pointSet):
+    """ Function that returns the point set as a (n,d) numpy array,
+    so that the sums over the points are vectorized. """
+    points = numpy.asarray(pointSet, dtype=float)
+    return points.reshape(points.shape[0], -1)
 
 #-------------------------------------------------------------
-def getSolution(c, A_ub, b_ub, A_eq, b_eq, bds):
-    
-    res = scipy.optimize.linprog(c, A_ub=A_ub, b_ub=b_ub,
-                                 A_eq=A_eq, b_eq=b_eq,
-                                 bounds=bds,
-                                 method='revised simplex')
-    print(res)
-
-    return res
-
-#-------------------------------------------------------------
-def getAndCheckSolution(c, A_ub, b_ub, A_eq, b_eq, bds):
-
-    res = getSolution(c, A_ub, b_ub, A_eq, b_eq, bds)
-    if res.success:
-        return res.x
-    else:
-        raise SolverError        
-
-#-------------------------------------------------------------
-def getSolFromSubProblem(pointSet, sol):
-    
-    nbCols = len(pointSet)
-
-    #objective function
-    #warning: opposite sign to get max instead of min
-    lst = []
-    for i, p in enumerate(pointSet):
-        sumTerm = 0
-        for j, q in enumerate(pointSet):
-            if j != i: 
-                sumTerm += 2*sol[j]*(p[0]*q[0]+p[1]*q[1])
-        lst.append( - (p[0]**2 + p[1]**2)*(1-2*sol[i]) + sumTerm )
-    c = numpy.array( lst )
-    print("#c", c)
-    
-    #constraints
-    #1d array
-    b = numpy.array( [1] )
-    #2d array
-    A = numpy.array( [ [1]*nbCols ] )
-
-    #bounds
-    bounds = (0, None) #applies to all variables
-    
-    #call to solver
-    return getAndCheckSolution(c,None,None,A,b,bounds)
+def getGradient(points, sol):
+    """ Function that returns the gradient of the dual objective
+    u -> sum_i u_i |p_i|^2 - |sum_i u_i p_i|^2 at sol, that is
+    |p_i|^2 - 2 <p_i, P^T u>. The Gram matrix P P^T is never formed,
+    so that the cost is O(n) instead of O(n^2).
+
+    :param: points, (n,2) numpy array
+    :param: sol, (n) numpy array
+    :return: (n) numpy array
+    """
+    return (points**2).sum(axis=1) - 2 * (points @ (points.T @ sol))
 
 #-------------------------------------------------------------
-def getSolByFrankWolfe(pointSet, sol, nbSteps = 50):
+def getSolByFrankWolfe(pointSet, sol, nbSteps = 1000, variant = "away",
+                       tolerance = 1e-6, verbose = True):
+    """ Function that maximizes the dual objective over the simplex
+    with the Frank-Wolfe algorithm. The step size is given by an exact
+    line search, the objective being quadratic. The duality gap
+    max_i g_i - <g, u>, g being the gradient, is also the difference
+    between the squared radius of the circle enclosing all the points
+    around the current center and the dual objective: the algorithm
+    stops when it is below tolerance times the dual objective.
+
+    :param: pointSet, sequence of pairs (x,y) or (n,d) numpy array
+    :param: sol, initial solution in the simplex
+    :param: nbSteps, maximal number of steps
+    :param: variant, "classic" (steps towards the best vertex),
+    "away" (may also step away from the worst vertex of the current
+    support) or "pairwise" (moves weight from the worst vertex of the
+    support to the best one)
+    :param: tolerance, relative tolerance on the duality gap
+    :param: verbose, print the duality gap at each step
+    :return: the solution
+    """
+    if variant not in ["classic", "away", "pairwise"]:
+        raise ValueError()
+
+    points = toArray(pointSet)
+    squaredNorms = (points**2).sum(axis=1)
+    currentSol = numpy.array(sol, dtype=float)
 
-    currentSol = sol
-    
     k = 1
     while k <= nbSteps:
-        print("#step {}".format(k))
-        s = getSolFromSubProblem(pointSet, currentSol)
-        alpha = 2/(k+2)
-        currentSol = currentSol + alpha*(s - currentSol)
-        print(alpha)
-        print(currentSol)
+        center = points.T @ currentSol
+        g = squaredNorms - 2 * (points @ center)
+        #best vertex, the point farthest from the center
+        i = int(numpy.argmax(g))
+        gu = g @ currentSol
+        gap = g[i] - gu
+        value = gu + center @ center
+        if verbose:
+            print("#step {} gap {}".format(k, gap))
+        if gap <= tolerance * value:
+            break
+
+        if variant != "classic":
+            #worst vertex of the support
+            support = numpy.flatnonzero(currentSol > 0)
+            j = support[numpy.argmin(g[support])]
+
+        #direction of the step: slope of the objective along it,
+        #shift of the center and largest feasible step
+        if variant == "pairwise":
+            slope, shift, maxStep = g[i] - g[j], points[i] - points[j], currentSol[j]
+        elif variant == "away" and gu - g[j] > gap:
+            slope, shift = gu - g[j], center - points[j]
+            maxStep = currentSol[j] / (1 - currentSol[j])
+        else:
+            j = None
+            slope, shift, maxStep = gap, points[i] - center, 1
+
+        #exact line search on the quadratic objective
+        curvature = shift @ shift
+        alpha = maxStep if curvature == 0 else min(slope / (2*curvature), maxStep)
+
+        if j is None:
+            currentSol *= 1 - alpha
+            currentSol[i] += alpha
+        elif variant == "pairwise":
+            currentSol[i] += alpha
+            currentSol[j] -= alpha
+        else:
+            currentSol *= 1 + alpha
+            currentSol[j] -= alpha
+        if j is not None and alpha == maxStep:
+            #drop step, the worst vertex leaves the support
+            currentSol[j] = 0
         k += 1
 
     return currentSol
 
+#-------------------------------------------------------------
+def getSolByCoreSet(pointSet, epsilon = 1e-3, nbSteps = 1000):
+    """ Function that computes a (1+epsilon)-approximation of the
+    smallest enclosing ball of a set of points in any dimension d,
+    following Badoiu and Clarkson: a core set is grown by adding, one
+    at a time, the point farthest from the center of the ball of the
+    core set, whose dual problem is solved by Frank-Wolfe. The core
+    set has O(1/epsilon) points, so that the running time is dominated
+    by the vectorized scans of the whole point set.
+
+    The dual objective of the core set is a lower bound of the squared
+    radius of the smallest enclosing ball, and the farthest point from
+    the center gives the radius of a ball enclosing all the points,
+    which certifies the returned epsilon.
+
+    :param: pointSet, sequence of points or (n,d) numpy array
+    :param: epsilon, required relative error on the radius
+    :param: nbSteps, maximal number of Frank-Wolfe steps per subproblem
+    :return: the solution, whose support is in the core set, the
+    certified epsilon, that may be greater than the required one if
+    the subproblems did not converge, and the list of indices of the
+    core set
+    """
+    points = toArray(pointSet)
+
+    i1 = farthestFromPoint(points, 0)
+    coreSet = [i1, farthestFromPoint(points, i1)]
+    coreSol = numpy.array([1., 0.])
+
+    while True:
+        corePoints = points[coreSet]
+        coreSol = getSolByFrankWolfe(corePoints, coreSol, nbSteps, "pairwise",
+                                     epsilon, verbose = False)
+        center = corePoints.T @ coreSol
+        lowerBound = coreSol @ (corePoints**2).sum(axis=1) - center @ center
+
+        d2 = ((points - center)**2).sum(axis=1)
+        farthest = int(numpy.argmax(d2))
+        if lowerBound > 0:
+            certified = math.sqrt(d2[farthest] / lowerBound) - 1
+        else:
+            certified = 0. if d2[farthest] == 0 else math.inf
+        if certified <= epsilon or farthest in coreSet:
+            break
+        coreSet.append(farthest)
+        coreSol = numpy.append(coreSol, 0.)
+
+    sol = numpy.zeros(points.shape[0])
+    sol[coreSet] = coreSol
+    return sol, certified, coreSet
+
 #-------------------------------------------------------------
 def farthestFromPoint(pointSet, pointIdx):
 
-    point = pointSet[pointIdx]
-    
-    dmax = 0
-    imax = pointIdx
-    for i, p in enumerate(pointSet):
-        d = (p[0]-point[0])**2 + (p[1]-point[1])**2
-        if d > dmax:
-            dmax = d
-            imax = i
-
-    return imax
+    points = toArray(pointSet)
+    d = ((points - points[pointIdx])**2).sum(axis=1)
+    return int(numpy.argmax(d))
             
 #-------------------------------------------------------------
 def getInitialSolution(pointSet):
@@ -108,12 +180,9 @@ def getInitialSolution(pointSet):
 #-------------------------------------------------------------
 def getParameters(pointSet, sol):
 
-    part1 = 0
-    cx = cy = 0
-    for i, p in enumerate(pointSet):
-        part1 += sol[i]*(p[0]**2 + p[1]**2)
-        cx += sol[i]*p[0]
-        cy += sol[i]*p[1]
+    points = toArray(pointSet)
+    part1 = sol @ (points**2).sum(axis=1)
+    cx, cy = points.T @ sol
 
     part2 = cx**2 + cy**2
 
@@ -126,50 +195,57 @@ def main():
     #parse command line    
     parser = argparse.ArgumentParser(description="program that computes \
     the smallest enclosing circle of a set of 2d points")
+    parser.add_argument("-n", "--number", help="number of points",
+                        type=int, default=100)
+    parser.add_argument("-a", "--variant", help="variant of Frank-Wolfe",
+                        choices=["classic", "away", "pairwise"],
+                        default="away")
+    parser.add_argument("-t", "--tolerance",
+                        help="relative tolerance on the duality gap",
+                        type=float, default=1e-6)
+    parser.add_argument("-e", "--epsilon",
+                        help="if given, compute a (1+epsilon)-approximation \
+                        of the circle on a core set",
+                        type=float)
+    parser.add_argument("-c", "--convexHull",
+                        help="only give the vertices of the convex hull to the solver",
+                        action="store_true")
     parser.add_argument("-w", "--visualize", help="show the scatter plot of the data",
                         action="store_true")
     args = parser.parse_args()
 
     #constants
-    n = 100 #number of points
+    n = args.number #number of points
     r = 100 #radius of the disc in which lie the generated points
     
     try:
         #input data generation
-        pointSet = [] #point set (points are pairs of coordinates (x,y))
-        random.seed()
-        for i in range(n):
-            accepted = False
-            while not accepted: 
-                x = random.random()*2*r
-                y = random.random()*2*r
-                if (x-r)**2 + (y-r)**2 <= r**2: 
-                    accepted = True
-            pointSet.append((x,y))
+        pointSet = getPointsInDisc(n, r) #point set (rows are pairs of coordinates (x,y))
+
+        if args.convexHull:
+            hull = getHullPoints(pointSet)
+            print("#convex hull of {} out of {} points (ratio {:.1f})".format(
+                len(hull), len(pointSet), len(pointSet) / len(hull)))
+            pointSet = hull
 
         #-----------------------------------
         #function
+        points = toArray(pointSet)
+        squaredNorms = (points**2).sum(axis=1)
+
         def phi(u):
-            part1 = 0
-            cx = cy = 0
-            for i, p in enumerate(pointSet):
-                part1 += u[i]*(p[0]**2 + p[1]**2)
-                cx += u[i]*p[0]
-                cy += u[i]*p[1]
+            part1 = u @ squaredNorms
+            cx, cy = points.T @ u
 
             part2 = cx**2 + cy**2
             return part1-part2
         
         def phi2(u):
-            part1 = 0
-            for i, p in enumerate(pointSet):
-                part1 += u[i]*(p[0]**2 + p[1]**2)
-
-            part2 = 0
-            for j1, p1 in enumerate(pointSet):
-                for j2, p2 in enumerate(pointSet):
-                    part2 += u[j1]*u[j2] \
-                        *(p1[0]*p2[0] + p1[1]*p2[1])
+            part1 = u @ squaredNorms
+
+            #quadratic form u^T G u of the Gram matrix G = P P^T,
+            #computed as u^T P (P^T u) without forming G
+            part2 = u @ (points @ (points.T @ u))
                     
             return part1-part2
             
@@ -195,7 +271,12 @@ def main():
         cx, cy, r2 = getParameters(pointSet, sol)
         print("#cx={}, cy={}, r={}, r^2={}".format(cx, cy, math.sqrt(r2), r2))
         #solve
-        sol = getSolByFrankWolfe(pointSet, sol)
+        if args.epsilon is None:
+            sol = getSolByFrankWolfe(pointSet, sol, variant=args.variant,
+                                     tolerance=args.tolerance)
+        else:
+            sol, epsilon, coreSet = getSolByCoreSet(pointSet, args.epsilon)
+            print("#core set of {} points, epsilon={}".format(len(coreSet), epsilon))
         print(sol, phi(sol), phi2(sol))
         assert(abs(phi(sol) - phi2(sol)) < 0.001)
         cx, cy, r2 = getParameters(pointSet, sol)
@@ -204,9 +285,6 @@ def main():
     except ValueError:
         print("Negative radius")
         sys.exit(1)        
-    except SolverError:
-        print("Could not solve the problem")
-        sys.exit(1)        
     except:
         print("Unexpected error")
         raise